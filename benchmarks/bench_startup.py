@@ -0,0 +1,84 @@
+"""
+Бенчмарк времени запуска CLI на маленьком файле лога.
+
+Скрипт многократно запускает main.py в отдельном процессе на файле из
+одной записи, поэтому измеряется в основном время импорта модулей и
+разбора аргументов, а не обработка логов. Выводит медиану и минимум
+времени запуска для каждой команды.
+
+Использование:
+    python benchmarks/bench_startup.py
+    python benchmarks/bench_startup.py --runs 50 --report status_code average
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+# Корень репозитория (каталог с main.py)
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Запись лога для тестового файла
+LOG_LINE = (
+    '{"@timestamp": "2025-06-22T13:57:32+00:00", "status": 200, "url": "/api/context", '
+    '"request_method": "GET", "response_time": 0.024, "http_user_agent": "curl"}\n'
+)
+
+
+def measure(command, runs):
+    """
+    Запускает команду несколько раз и измеряет время каждого запуска.
+
+    Args:
+        command (list[str]): Команда для subprocess
+        runs (int): Количество запусков
+
+    Returns:
+        list[float]: Время запусков в секундах
+    """
+
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(command, cwd=ROOT, check=True, stdout=subprocess.DEVNULL)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def main():
+    """Запускает бенчмарк для выбранных отчетов и выводит результаты."""
+    parser = argparse.ArgumentParser(description="Бенчмарк времени запуска main.py")
+    parser.add_argument("--runs", type=int, default=30, help="Количество запусков")
+    parser.add_argument("--report", nargs="+", default=["status_code"],
+                        help="Отчеты, для которых измеряется запуск")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        log = os.path.join(directory, "tiny.log")
+        with open(log, "w", encoding="utf-8") as f:
+            f.write(LOG_LINE)
+
+        commands = {
+            "python -c pass": [sys.executable, "-c", "pass"],
+        }
+        for report in args.report:
+            commands[f"--report {report}"] = [
+                sys.executable, "main.py", "--file", log, "--report", report,
+            ]
+            commands[f"--report {report} --emit-partial"] = [
+                sys.executable, "main.py", "--file", log, "--report", report,
+                "--emit-partial", os.path.join(directory, "partial.bin"),
+            ]
+
+        for name, command in commands.items():
+            timings = measure(command, args.runs)
+            print(f"{name:<45} медиана {statistics.median(timings) * 1000:7.1f} мс"
+                  f"   мин. {min(timings) * 1000:7.1f} мс")
+
+
+if __name__ == "__main__":
+    main()
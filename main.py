@@ -6,22 +6,90 @@
 
 Использование:
     python main.py --file <файлы> --report <типы_отчетов> [--date <дата>]
+                   [--memory-limit <размер>] [--reader <способ>] [--prefetch <N>]
+                   [--emit-partial <снимок>]
+                   [--format <формат>] [--sort <поле>] [--ascending] [--top <N>]
+    python main.py --merge-partials <снимки> --report <типы_отчетов>
 
 Аргументы:
-    --file      Один или несколько файлов логов (обязательный)
-    --report    Тип отчета: average, status_code, user_agent или all (обязательный)
+    --file      Один или несколько файлов логов, директорий или glob-шаблонов,
+                например "/var/log/nginx/access.log*" (обязательный, если не
+                указан --merge-partials). С --date файлы, первая и последняя
+                записи которых не покрывают дату, не читаются. Формат
+                (JSON или combined/common nginx/Apache) определяется
+                для каждого файла по первой непустой строке
+    --report    Тип отчета: average, status_code, user_agent, slowest, slo или all
+                (обязательный)
     --date      Фильтр по дате в формате YYYY-MM-DD (опционально)
+    --no-prune  Не пропускать файлы по диапазону дат (для файлов, записи
+                в которых не упорядочены по времени)
+    --memory-limit  Общий лимит памяти агрегатов отчетов, например 512M или 2G
+                (опционально). Лимит делится поровну между выбранными
+                отчетами с неограниченным числом ключей (average, user_agent,
+                slo). При достижении лимита данные сбрасываются во временные
+                файлы и объединяются при выводе
+    --reader    Способ чтения файлов: bytes (по умолчанию) - блоками в bytes;
+                пустые строки и строки, отклоненные --date, отбрасываются
+                без декодирования и разбора JSON, остальные декодируются
+                при разборе. mmap - как bytes, но через отображение файла
+                в память, text - построчно в кодировке UTF-8
+    --prefetch  Количество блоков (по 1 МиБ), читаемых наперед в фоновом потоке,
+                пока основной поток разбирает строки (по умолчанию 4; 0 -
+                без фонового чтения). Только для --reader bytes и mmap
+    --slowest   Количество запросов в отчете slowest (по умолчанию 10)
+    --slo-window     Длина окна отчета slo в секундах (по умолчанию 300)
+    --slo-windows    Количество последних окон каждого URL (по умолчанию 12)
+    --slo-error-rate Допустимая доля ответов 5xx (по умолчанию 0.01)
+    --slo-latency    Порог медленного запроса в секундах (по умолчанию 1.0)
+    --slo-slow-rate  Допустимая доля медленных запросов (по умолчанию 0.05)
+    --slo-max-breaches Количество окон с нарушением каждого URL, сохраняемых
+                после вытеснения из буфера окон (по умолчанию 100)
+    --format    Формат вывода: table (по умолчанию) - таблицы, json - JSON Lines
+                (объект на строку с ключом "report"), csv - CSV с заголовком,
+                openmetrics - метрики для Prometheus. Машиночитаемые форматы
+                выводятся построчно, без сборки таблицы в памяти
+    --sort      Поле сортировки строк отчета (по убыванию), например count,
+                avg_time, stddev или response_time. Отчеты без этого поля
+                выводятся в исходном порядке (с --top - по своему полю)
+    --ascending Сортировать по возрастанию
+    --top       Вывести N первых строк каждого отчета; без --sort строки
+                упорядочиваются по count (response_time для slowest).
+                Отбор выполняется через кучу без полной сортировки
+    --emit-partial  Вместо вывода таблиц записать снимок частичных
+                агрегатов выбранных отчетов в файл (опционально). Снимок
+                собирается в памяти целиком, --memory-limit на этот шаг
+                не распространяется
+    --merge-partials  Объединить снимки, созданные --emit-partial, и
+                вывести итоговые таблицы (вместо --file)
 
 Доступные отчеты:
-    average     - Среднее время ответа по endpoint'ам
+    average     - Среднее, минимальное, максимальное время ответа и его
+                  разброс (дисперсия, ст. отклонение) по endpoint'ам
     status_code - Распределение HTTP статус-кодов
     user_agent  - Распределение User-Agent'ов
+    slowest     - K самых медленных запросов (время, URL, статус, User-Agent)
+    slo         - Окна времени, в которых endpoint превысил допустимую долю
+                  ответов 5xx или медленных запросов, и burn rate бюджета
+    Отчеты сторонних пакетов подключаются через entry points группы
+    "workmate.reports" (см. reports.registry)
 
 Модули:
     reports.average_report   - Отчет по среднему времени ответа
     reports.status_report    - Отчет по кодам статуса
     reports.user_agent_report - Отчет по User-Agent'ам
+    reports.slowest_report   - Отчет по самым медленным запросам
+    reports.slo_report       - Отчет по SLO и бюджету ошибок в окнах времени
+    reports.registry         - Реестр отчетов с отложенным импортом
+    reports.printers         - Форматирование отчетов в таблицы
+    reports.output           - Форматы вывода и отбор строк --sort/--top
+    reports.writers          - Потоковые форматы json, csv, openmetrics
     utils.log_parser         - Парсер логов
+    utils.record             - Компактные записи LogRecord и пакеты RecordBatch
+    utils.stats              - Объединяемая потоковая статистика времени ответа
+    utils.aggregator         - Агрегация с ограничением памяти (spill-to-disk)
+    utils.file_selector      - Раскрытие директорий/шаблонов и отбор файлов по дате
+    utils.snapshot           - Снимки частичных агрегатов для распределенного слияния
+    utils.prefetch           - Чтение блоков наперед в фоновом потоке
 
 Примеры использования:
 
@@ -29,6 +97,8 @@
     python main.py --file access.log --report average
     python main.py --file access.log --report user_agent
     python main.py --file access.log --report status_code
+    python main.py --file access.log --report slowest --slowest 20
+    python main.py --file access.log --report slo --slo-window 60 --slo-windows 60
 
 - С фильтрацией по дате:
     python main.py --file access.log --report average --date 2025-06-22
@@ -38,130 +108,399 @@
     python main.py --file access.log error.log --report average
     python main.py --file access.log error.log --report all --date 2025-06-22
 
+- С директорией или шаблоном (файлы вне даты не открываются):
+    python main.py --file /var/log/nginx/ --report status_code --date 2025-06-22
+    python main.py --file "/var/log/nginx/access.log*" --report average --date 2025-06-22
+
+- Топ endpoint'ов и машиночитаемый вывод:
+    python main.py --file access.log --report average --sort avg_time --top 20
+    python main.py --file access.log --report all --format json
+    python main.py --file access.log --report status_code --format openmetrics
+
+- С ограничением памяти:
+    python main.py --file access.log --report user_agent --memory-limit 512M
+
+- Распределенная обработка (снимки на узлах и слияние на одном узле):
+    python main.py --file access.log --report all --emit-partial edge1.bin
+    python main.py --merge-partials edge1.bin edge2.bin --report all
+
 Запуск тестов:
     python -m pytest tests/ -v
 """
 
 import argparse
-from tabulate import tabulate
+import os
+import sys
+
+from reports.base import accumulate_reports
+from reports.registry import ReportRegistry, load_object
+from reports.output import FORMATS, select
+from utils.aggregator import parse_memory_limit
+from utils.file_selector import expand_paths, prune_files
+from utils.log_parser import READERS, load_lines
+from utils.prefetch import DEFAULT_DEPTH
+from utils.snapshot import read_snapshot, write_snapshot
 
-from reports.average_report import AverageReport
-from reports.status_report import StatusReport
-from reports.user_agent_report import UserAgentReport
-from utils.log_parser import load_lines
 
+# Реестр отчетов {имя: отчет}: модули отчетов и tabulate импортируются
+# только для выбранных отчетов (новые отчеты объявляются в reports.registry
+# или через entry points группы "workmate.reports")
+REPORTS = ReportRegistry()
 
-# Словарь доступных отчетов (расширять при создании новых классов отчетов)
-REPORTS = {
-    "average": AverageReport(),
-    "status_code": StatusReport(),
-    "user_agent": UserAgentReport(),
-}
+# Функции форматирования для каждого типа отчета
+PRINTERS = REPORTS.printers
 
 
-def print_average(data):
+def positive_int(value):
     """
-    Формирует таблицу с данными о среднем времени ответа.
+    Разбирает положительное целое число из аргумента командной строки.
 
     Args:
-        data (dict): Словарь с данными в формате {url: {"count": int, "avg_time": float}}
+        value (str): Значение аргумента
 
     Returns:
-        str: Отформатированная таблица в виде строки
+        int: Число больше нуля
+
+    Raises:
+        argparse.ArgumentTypeError: Если значение не положительное целое
     """
-    table = []
-    headers = ["Endpoint", "Запросов", "Ср. время (с)"]
-    for url, info in data.items():
-        table.append([url, info["count"], round(info["avg_time"], 3)])
-    return tabulate(table, headers=headers, tablefmt="grid")
+    try:
+        number = int(value)
+    except ValueError:
+        number = 0
+    if number <= 0:
+        raise argparse.ArgumentTypeError(f"ожидается положительное целое число: {value!r}")
+    return number
 
 
-def print_status(data):
+def positive_float(value):
     """
-    Формирует таблицу со статистикой кодов статуса.
+    Разбирает положительное конечное число из аргумента командной строки.
 
     Args:
-        data (dict): Словарь с данными в формате {status_code: count}
+        value (str): Значение аргумента
 
     Returns:
-        str: Отформатированная таблица в виде строки
-        """
-    table = []
-    headers = ["Статус", "Кол-во"]
-    for code, count in data.items():
-        table.append([code, count])
-    return tabulate(table, headers=headers, tablefmt="grid")
+        float: Число больше нуля
+
+    Raises:
+        argparse.ArgumentTypeError: Если значение не положительное число
+    """
+    try:
+        number = float(value)
+    except ValueError:
+        number = 0.0
+    if not 0 < number < float("inf"):
+        raise argparse.ArgumentTypeError(f"ожидается положительное число: {value!r}")
+    return number
 
 
-def print_user_agents(data):
+def non_negative_int(value):
     """
-    Формирует таблицу с количественной статистикой User-Agent'ов.
+    Разбирает неотрицательное целое число из аргумента командной строки.
 
     Args:
-        data (dict): Словарь с данными в формате {user_agent: count}
+        value (str): Значение аргумента
 
     Returns:
-        str: Отформатированная таблица в виде строки
+        int: Число больше или равное нулю
+
+    Raises:
+        argparse.ArgumentTypeError: Если значение не целое или отрицательное
     """
-    table = []
-    headers = ["User-Agent", "Кол-во"]
-    for ua, count in data.items():
-        table.append([ua, count])
-    return tabulate(table, headers=headers, tablefmt="grid")
+    try:
+        number = int(value)
+    except ValueError:
+        number = -1
+    if number < 0:
+        raise argparse.ArgumentTypeError(f"ожидается неотрицательное целое число: {value!r}")
+    return number
 
-# Словарь функций форматирования для каждого типа отчета
-# (расширять при создании новых классов отчетов)
-PRINTERS = {
-    "average": print_average,
-    "status_code": print_status,
-    "user_agent": print_user_agents,
-}
 
+def share_memory_limit(limit, report_types):
+    """
+    Делит общий лимит памяти между отчетами, которые сбрасывают агрегаты на диск.
 
-def main():
+    Args:
+        limit (int | None): Общий лимит памяти в байтах (--memory-limit)
+        report_types (Iterable[type]): Классы выбранных отчетов
+
+    Returns:
+        int | None: Лимит памяти одного отчета; None - без ограничения
+
+    Notes:
+        - Каждый отчет с spills = True получает свой агрегатор, поэтому без
+          деления суммарный объем агрегатов кратно превышал бы лимит
     """
-    Основная функция программы.
 
-    Обрабатывает аргументы командной строки, загружает логи,
-    генерирует отчеты и выводит результаты.
+    spilling = sum(1 for report_type in report_types if report_type.spills)
+    if limit is None or spilling < 2:
+        return limit
+    return max(limit // spilling, 1)
+
+
+def merge_partials(reports, paths):
+    """
+    Объединяет снимки частичных агрегатов, созданные --emit-partial.
+
+    Args:
+        reports (dict): Словарь {имя: отчет} выбранных отчетов
+        paths (list[str]): Пути к файлам снимков
+
+    Returns:
+        dict: Словарь {имя: объединенное состояние}. Отчеты, которых
+              нет ни в одном снимке, остаются с пустым состоянием.
+
+    Raises:
+        OSError: Если файл снимка не существует или не читается
+        ValueError: Если файл не является снимком или состояние отчета
+                    в нем повреждено
+    """
+
+    states = {name: report.new_state() for name, report in reports.items()}
+    for path in paths:
+        try:
+            snapshot = read_snapshot(path)
+            for name, report in reports.items():
+                if name in snapshot:
+                    partial = report.load_state(snapshot[name])
+                    states[name] = report.merge(states[name], partial)
+        except ValueError as error:
+            raise ValueError(f"{path}: {error}") from error
+        except (KeyError, IndexError, TypeError) as error:
+            raise ValueError(f"{path}: поврежденное состояние отчета ({error!r})") from error
+    return states
+
+
+def write_reports(reports, states, args):
+    """
+    Финализирует отчеты и выводит их в выбранном формате.
+
+    Args:
+        reports (dict): Словарь {имя: отчет}
+        states (dict): Словарь {имя: состояние отчета}
+        args (argparse.Namespace): Аргументы с полями format, sort, top, ascending
+    """
+
+    # Генератор: следующий отчет финализируется после вывода предыдущего
+    results = (
+        (name, report, select(report, report.finalize(states[name]),
+                              args.sort, args.top, args.ascending))
+        for name, report in reports.items()
+    )
+
+    if args.format != "table":
+        # Модули потоковых форматов (csv, tempfile) не нужны для вывода таблиц
+        writers = load_object("reports.writers:WRITERS")
+        writers[args.format](sys.stdout, results)
+        return
+
+    for name, _, data in results:
+        if data:
+            print(f"\nОтчет: {name}")
+            print("-" * 60)
+            print(PRINTERS[name](data))
+            print()
+
+
+def build_parser():
+    """
+    Создает парсер аргументов командной строки.
+
+    Returns:
+        argparse.ArgumentParser: Парсер с аргументами main.py
     """
     parser = argparse.ArgumentParser(
         description="Анализатор логов веб-сервера",
         epilog="Пример: python main.py --file my_logs.log --report all"
     )
-    parser.add_argument(
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument(
         "--file",
-        required=True,
         nargs="+",
-        help="Один или несколько файлов логов для анализа"
+        help="Файлы логов, директории или glob-шаблоны для анализа"
+    )
+    source.add_argument(
+        "--merge-partials",
+        nargs="+",
+        metavar="SNAPSHOT",
+        help="Объединить снимки частичных агрегатов вместо чтения логов"
     )
     parser.add_argument(
         "--report",
         required=True,
         nargs="+",
-        choices=list(REPORTS.keys()) + ["all"],
-        help="Тип отчета: average, status_code, user_agent или all"
+        metavar="REPORT",
+        help="Тип отчета: average, status_code, user_agent, slowest, slo, "
+             "отчет из entry points или all"
     )
     parser.add_argument(
         "--date",
         help="Фильтр по дате в формате YYYY-MM-DD"
     )
-    args = parser.parse_args()
+    parser.add_argument(
+        "--no-prune",
+        action="store_true",
+        help="Не пропускать файлы по диапазону дат первой и последней записи"
+    )
+    parser.add_argument(
+        "--memory-limit",
+        type=parse_memory_limit,
+        help="Общий лимит памяти агрегатов отчетов (например 512M или 2G), "
+             "который делится между отчетами average, user_agent и slo"
+    )
+    parser.add_argument(
+        "--reader",
+        choices=READERS,
+        default="bytes",
+        help="Способ чтения файлов: bytes (по умолчанию; строки вне --date "
+             "отбрасываются без декодирования и разбора JSON), "
+             "mmap (отображение файла в память) или text"
+    )
+    parser.add_argument(
+        "--prefetch",
+        type=non_negative_int,
+        metavar="DEPTH",
+        help=f"Количество блоков, читаемых наперед в фоновом потоке "
+             f"(по умолчанию {DEFAULT_DEPTH}; 0 - без фонового чтения)"
+    )
+    parser.add_argument(
+        "--slowest",
+        type=positive_int,
+        metavar="K",
+        help="Количество запросов в отчете slowest (по умолчанию 10)"
+    )
+    parser.add_argument(
+        "--slo-window",
+        type=positive_int,
+        metavar="SECONDS",
+        help="Длина окна отчета slo в секундах (по умолчанию 300)"
+    )
+    parser.add_argument(
+        "--slo-windows",
+        type=positive_int,
+        metavar="N",
+        help="Количество последних окон каждого URL в отчете slo (по умолчанию 12)"
+    )
+    parser.add_argument(
+        "--slo-error-rate",
+        type=positive_float,
+        metavar="RATE",
+        help="Допустимая доля ответов 5xx в окне (по умолчанию 0.01)"
+    )
+    parser.add_argument(
+        "--slo-latency",
+        type=positive_float,
+        metavar="SECONDS",
+        help="Порог медленного запроса в секундах (по умолчанию 1.0)"
+    )
+    parser.add_argument(
+        "--slo-slow-rate",
+        type=positive_float,
+        metavar="RATE",
+        help="Допустимая доля медленных запросов в окне (по умолчанию 0.05)"
+    )
+    parser.add_argument(
+        "--slo-max-breaches",
+        type=positive_int,
+        metavar="N",
+        help="Количество окон с нарушением каждого URL, сохраняемых после "
+             "вытеснения из буфера окон (по умолчанию 100)"
+    )
+    parser.add_argument(
+        "--emit-partial",
+        metavar="SNAPSHOT",
+        help="Записать снимок частичных агрегатов в файл вместо вывода таблиц "
+             "(снимок собирается в памяти, --memory-limit к нему не применяется)"
+    )
+    parser.add_argument(
+        "--format",
+        choices=FORMATS,
+        default="table",
+        help="Формат вывода: table (по умолчанию), json (JSON Lines), csv "
+             "или openmetrics"
+    )
+    parser.add_argument(
+        "--sort",
+        metavar="FIELD",
+        help="Сортировать строки отчетов по полю, например count или avg_time "
+             "(по убыванию)"
+    )
+    parser.add_argument(
+        "--ascending",
+        action="store_true",
+        help="Сортировать по возрастанию"
+    )
+    parser.add_argument(
+        "--top",
+        type=positive_int,
+        metavar="N",
+        help="Вывести только N первых строк каждого отчета после сортировки"
+    )
+    return parser
+
 
-    # Загрузка и парсинг строк логов
-    lines = list(load_lines(args.file, args.date))
+def main():
+    """
+    Основная функция программы.
 
-    # Выбор отчетов для генерации
-    reports = REPORTS if "all" in args.report else {r: REPORTS[r] for r in args.report}
+    Обрабатывает аргументы командной строки, загружает логи,
+    генерирует отчеты и выводит результаты.
+    """
+    parser = build_parser()
+    args = parser.parse_args()
 
-    # Генерация и вывод отчетов
-    for name, report in reports.items():
-        data = report.generate(lines)
-        if data:
-            print(f"\nОтчет: {name}")
-            print("-" * 60)
-            print(PRINTERS[name](data))
-            print()
+    # Выбор отчетов для генерации (новые экземпляры с параметрами запуска)
+    # Имена проверяются без импорта модулей отчетов (в отличие от choices)
+    unknown = [name for name in args.report if name != "all" and name not in REPORTS]
+    if unknown:
+        parser.error(f"неизвестный отчет: {', '.join(unknown)}")
+    names = list(REPORTS) if "all" in args.report else args.report
+    report_types = {name: type(REPORTS[name]) for name in names}
+    args.memory_limit = share_memory_limit(args.memory_limit, report_types.values())
+    reports = {name: report_type.from_args(args) for name, report_type in report_types.items()}
+    # Поле сортировки проверяется до чтения логов
+    if args.sort and not any(args.sort in report.fields for report in reports.values()):
+        parser.error(f"ни один из выбранных отчетов не содержит поле {args.sort!r}")
+
+    if args.merge_partials:
+        try:
+            states = merge_partials(reports, args.merge_partials)
+        except (OSError, ValueError) as error:
+            parser.error(f"не удалось объединить снимки: {error}")
+    else:
+        files = expand_paths(args.file)
+        if not files:
+            parser.error("по указанным путям не найдено ни одного файла")
+        if not args.no_prune:
+            # Файлы вне диапазона --date не открываются для чтения
+            files = prune_files(files, args.date)
+
+        # Потоковое чтение логов: каждая строка парсится один раз для всех отчетов
+        # Чтение наперед по умолчанию включено для байтовых режимов
+        prefetch_depth = args.prefetch
+        if prefetch_depth is None:
+            prefetch_depth = 0 if args.reader == "text" else DEFAULT_DEPTH
+        elif prefetch_depth and args.reader == "text":
+            parser.error("--prefetch поддерживается только с --reader bytes или mmap")
+        lines = load_lines(files, args.date, args.reader, prefetch_depth)
+        states = accumulate_reports(reports, lines)
+
+    if args.emit_partial:
+        write_snapshot(args.emit_partial, {
+            name: report.dump_state(states[name]) for name, report in reports.items()
+        })
+        return
+
+    try:
+        write_reports(reports, states, args)
+        sys.stdout.flush()
+    except BrokenPipeError:
+        # Получатель вывода закрыл канал (например, "| head"): остаток вывода
+        # направляется в devnull, чтобы сброс буфера при выходе не вызвал ошибку
+        devnull = os.open(os.devnull, os.O_WRONLY)
+        os.dup2(devnull, sys.stdout.fileno())
+        sys.exit(1)
 
 
 if __name__ == "__main__":
@@ -3,25 +3,45 @@
 
 Этот модуль предоставляет класс AverageReport для анализа
 среднего времени ответа различных URL endpoint'ов на основе логов.
+Помимо среднего отчет вычисляет минимум, максимум, дисперсию и
+стандартное отклонение за один проход (см. utils.stats).
 """
 
-from collections import defaultdict
-from utils.log_parser import _try_parse_json
-from .base import BaseReport
+import math
 
+from utils.aggregator import MergedItems, SpillingAggregator
+from utils.stats import LatencyStats
+from .base import KeyedReport
 
-class AverageReport(BaseReport):
+
+def _summary(stats):
+    """Преобразует LatencyStats в строку отчета."""
+    return {
+        "count": stats.count,
+        "avg_time": stats.average,
+        "min_time": stats.min,
+        "max_time": stats.max,
+        "variance": stats.variance,
+        "stddev": stats.stddev,
+    }
+
+
+class AverageReport(KeyedReport):
     """
     Класс для генерации отчета по среднему времени ответа endpoint'ов.
 
-    Наследуется от BaseReport и реализует метод generate() для анализа
+    Наследуется от KeyedReport и реализует шаги генерации для анализа
     среднего времени ответа различных URL на основе логов веб-сервера.
 
     Attributes:
-        Нет публичных атрибутов
+        memory_limit (int | None): Лимит памяти для статистики по URL в байтах
 
     Methods:
         generate(lines): Генерирует отчет со статистикой по URL
+        new_state(): Создает агрегатор статистики по URL
+        update(state, record): Учитывает время ответа одной записи
+        update_batch(state, batch): Учитывает время ответа пакета записей
+        finalize(state): Вычисляет итоговую статистику по URL
 
 
     Использование:
@@ -30,63 +50,86 @@ class AverageReport(BaseReport):
         data = report.generate(parsed_lines)
     """
 
-    def generate(self, lines):
+    printer = "reports.printers:print_average"
+    fields = ("url", "count", "avg_time", "min_time", "max_time", "variance", "stddev")
+    sort_field = "count"
+    spills = True
+
+    def new_state(self):
+        """
+        Создает потоковую статистику по URL с ограничением памяти.
+
+        Returns:
+            SpillingAggregator: Агрегатор {url: LatencyStats}
+        """
+
+        return SpillingAggregator(LatencyStats, LatencyStats.merge,
+                                  memory_limit=self.memory_limit,
+                                  codec=(LatencyStats.to_list, LatencyStats.from_list))
+
+    def update(self, state, record):
+        """
+        Обновляет статистику URL временем ответа записи.
+
+        Args:
+            state (SpillingAggregator): Статистика по URL
+            record (LogRecord): Запись лога
+
+        Notes:
+            - Игнорирует записи без URL или с некорректным временем ответа
+              (такие записи имеют response_time None после разбора)
+        """
+
+        if record.url and record.response_time is not None:
+            state.get(record.url).add(record.response_time)
+
+    def update_batch(self, state, batch):
         """
-        Анализирует логи и вычисляет среднее время ответа для каждого URL.
+        Обновляет статистику по колонкам urls и response_times пакета.
 
-        Обрабатывает каждую строку лога, извлекает URL и время ответа,
-        агрегирует статистику и вычисляет средние значения.
+        Args:
+            state (SpillingAggregator): Статистика по URL
+            batch (RecordBatch): Пакет записей лога
+        """
+
+        get = state.get
+        isnan = math.isnan
+        for url, rt in zip(batch.urls, batch.response_times):
+            # NaN - отсутствующее время ответа
+            if url and not isnan(rt):
+                get(url).add(rt)
+
+    def finalize(self, state):
+        """
+        Вычисляет итоговую статистику времени ответа для каждого URL.
 
         Args:
-            lines (list): Список строк логов. Каждая строка может быть:
-                         - JSON-строкой для парсинга
-                         - Уже распарсенным словарем
+            state (SpillingAggregator): Статистика по URL
 
         Returns:
-            dict: Словарь с статистикой по каждому URL в формате:
+            dict | MergedItems: Словарь с статистикой по каждому URL в формате:
                   {
                       "url": {
-                          "count": int,      # Количество запросов
-                          "avg_time": float  # Среднее время ответа в секундах
+                          "count": int,       # Количество запросов
+                          "avg_time": float,  # Среднее время ответа в секундах
+                          "min_time": float,  # Минимальное время ответа
+                          "max_time": float,  # Максимальное время ответа
+                          "variance": float,  # Дисперсия времени ответа
+                          "stddev": float     # Стандартное отклонение
                       }
                   }
 
         Notes:
-            - Пропускает строки, которые не удается распарсить
-            - Игнорирует записи с некорректным временем ответа
-            - Использует defaultdict для автоматической инициализации статистики
+            - При заданном memory_limit статистика сбрасывается на диск, а
+              результат возвращается как ленивый MergedItems, отсортированный по URL
         """
 
-        # Инициализация словаря со статистикой с автоматической инициализацией
-        stats = defaultdict(lambda: {"count": 0, "total_time": 0.0})
-
-        # Обработка каждой строки лога
-        for line in lines:
-            # Парсинг JSON или использование готового словаря
-            obj = _try_parse_json(line)
-            if not obj:
-                continue
-
-            # Извлечение URL и времени ответа
-            url = obj.get("url")
-            rt = obj.get("response_time")
-
-            # Проверка наличия обязательных полей
-            if url and rt is not None:
-                try:
-                    # Конвертация времени ответа в float и обновление статистики
-                    rt = float(rt)
-                    stats[url]["count"] += 1
-                    stats[url]["total_time"] += rt
-                except ValueError:
-                    # Пропуск записей с некорректным временем ответа
-                    continue
-
-        # Вычисление средних значений для каждого URL
+        items = state.items()
+        if isinstance(items, MergedItems):
+            # Данные сбрасывались на диск - вычисляем итоги лениво при слиянии
+            return items.map_values(_summary)
+
         result = {}
-        for url, data in stats.items():
-            result[url] = {
-                "count": data["count"],
-                "avg_time": data["total_time"] / data["count"]
-            }
+        for url, url_stats in items:
+            result[url] = _summary(url_stats)
         return result
@@ -3,52 +3,268 @@
 
 Этот модуль определяет абстрактный базовый класс для всех отчетов,
 гарантируя единый интерфейс для генерации различных типов отчетов.
+
+Генерация отчета разбита на шаги: создание пустого состояния, обновление
+состояния записями лога, объединение частичных состояний и финализация.
+Отчеты получают не сырые строки, а записи LogRecord или пакеты RecordBatch
+(см. utils.record), типы полей которых приведены один раз при разборе.
+Частичные состояния можно сериализовать (dump_state/load_state), чтобы
+агрегировать логи на разных узлах и объединять результаты в одном месте.
+
+Функции:
+    accumulate_reports(reports, lines): Обновляет состояния всех отчетов за один проход
 """
 
 from abc import ABC, abstractmethod
 
+from utils.record import iter_batches
+
+
 class BaseReport(ABC):
     """
     Абстрактный базовый класс для всех отчетов анализатора логов.
 
     Attributes:
-        Нет публичных атрибутов
+        memory_limit (int | None): Лимит памяти агрегатов отчета в байтах.
+                                   None - без ограничения
+        printer (str | None): Функция форматирования данных отчета в формате
+                              "модуль:функция" (см. reports.registry).
+                              None - таблица по умолчанию
+        fields (tuple[str]): Поля строк отчета для машиночитаемых форматов
+                             (см. reports.writers). Для отчетов-словарей первое
+                             поле - имя ключа, второе - имя скалярного значения
+        sort_field (str | None): Поле сортировки для --top без --sort.
+                                 None - исходный порядок строк
+        spills (bool): Отчет ограничивает память агрегатов memory_limit.
+                       Общий лимит --memory-limit делится поровну между
+                       выбранными отчетами с spills = True
 
     Methods:
-        generate(lines): Абстрактный метод для генерации отчета
+        generate(lines): Генерирует отчет по строкам лога
+        from_args(args): Создает отчет по аргументам командной строки
+        new_state(): Создает пустое частичное состояние
+        update(state, record): Обновляет состояние одной записью лога
+        update_batch(state, batch): Обновляет состояние пакетом записей
+        merge(state, other): Объединяет два частичных состояния
+        finalize(state): Преобразует состояние в данные отчета
+        dump_state(state): Сериализует состояние в JSON-совместимый вид
+        load_state(data): Восстанавливает состояние из dump_state()
 
     Использование:
     from reports.base import BaseReport
 
     class CustomReport(BaseReport):
-        def generate(self, lines):
-            # Реализация генерации отчета
-            return processed_data
+        def new_state(self):
+            return {}
+
+        def update(self, state, record):
+            # Обновление состояния записью лога
+            ...
 
     Для создания собственного отчета необходимо наследоваться от BaseReport
-    и реализовать метод generate().
+    и реализовать абстрактные методы работы с состоянием.
     """
-    @abstractmethod
+
+    printer = None
+    fields = ("key", "value")
+    sort_field = None
+    spills = False
+
+    def __init__(self, memory_limit=None):
+        """
+        Args:
+            memory_limit (int | None): Лимит памяти для агрегатов отчета в байтах.
+                                       Отчеты с неограниченным количеством ключей
+                                       сбрасывают данные на диск при его достижении.
+        """
+        self.memory_limit = memory_limit
+
+    @classmethod
+    def from_args(cls, args):
+        """
+        Создает отчет с параметрами из аргументов командной строки.
+
+        Отчеты с собственными параметрами переопределяют этот метод.
+
+        Args:
+            args (argparse.Namespace): Разобранные аргументы main.py
+
+        Returns:
+            BaseReport: Новый экземпляр отчета
+        """
+        return cls(memory_limit=args.memory_limit)
+
     def generate(self, lines):
         """
-        Генерирует отчет на основе проанализированных строк лога.
+        Генерирует отчет на основе строк лога.
 
         Args:
-            lines (list): Список распарсенных строк лога в формате словарей.
-                         Каждая строка содержит ключи как минимум:
+            lines (list): Список строк лога в JSON формате (str или bytes).
+                         Записи могут содержать ключи:
                          - url: URL endpoint'а
                          - status: HTTP статус-код
                          - response_time: Время ответа в секундах
-                         - user_agent: Строка User-Agent
-                         - timestamp: Временная метка запроса
+                         - http_user_agent: Строка User-Agent
+                         - @timestamp: Временная метка запроса
 
         Returns:
             dict: Словарь с обработанными данными отчета. Формат зависит
                  от конкретной реализации отчета.
 
-        Raises:
-            NotImplementedError: Если метод не реализован в дочернем классе
-            ValueError: Если входные данные некорректны
-            KeyError: Если в данных отсутствуют обязательные поля
+        Notes:
+            - Строки, которые не удается распарсить, пропускаются
+        """
+
+        state = self.new_state()
+        for batch in iter_batches(lines):
+            self.update_batch(state, batch)
+        return self.finalize(state)
+
+    @abstractmethod
+    def new_state(self):
+        """
+        Создает пустое частичное состояние отчета.
+
+        Returns:
+            object: Состояние, которое принимают update(), merge() и finalize()
+        """
+        raise NotImplementedError("Метод new_state должен быть реализован в дочернем классе")
+
+    @abstractmethod
+    def update(self, state, record):
+        """
+        Обновляет состояние одной записью лога.
+
+        Args:
+            state (object): Состояние из new_state()
+            record (LogRecord): Запись лога с нормализованными полями
+        """
+        raise NotImplementedError("Метод update должен быть реализован в дочернем классе")
+
+    def update_batch(self, state, batch):
+        """
+        Обновляет состояние пакетом записей.
+
+        По умолчанию вызывает update() для каждой записи. Отчеты переопределяют
+        метод, чтобы читать только нужные колонки пакета.
+
+        Args:
+            state (object): Состояние из new_state()
+            batch (RecordBatch): Пакет записей лога
+        """
+        for record in batch:
+            self.update(state, record)
+
+    @abstractmethod
+    def merge(self, state, other):
+        """
+        Объединяет два частичных состояния (например, с разных файлов или узлов).
+
+        Args:
+            state (object): Состояние, в которое выполняется объединение
+            other (object): Объединяемое состояние
+
+        Returns:
+            object: Объединенное состояние
+        """
+        raise NotImplementedError("Метод merge должен быть реализован в дочернем классе")
+
+    @abstractmethod
+    def finalize(self, state):
+        """
+        Преобразует частичное состояние в данные отчета.
+
+        Args:
+            state (object): Состояние отчета
+
+        Returns:
+            dict: Данные отчета для функции форматирования
+        """
+        raise NotImplementedError("Метод finalize должен быть реализован в дочернем классе")
+
+    @abstractmethod
+    def dump_state(self, state):
+        """
+        Сериализует частичное состояние в JSON-совместимый вид.
+
+        Args:
+            state (object): Состояние отчета
+
+        Returns:
+            list | dict: JSON-совместимое представление состояния
+        """
+        raise NotImplementedError("Метод dump_state должен быть реализован в дочернем классе")
+
+    @abstractmethod
+    def load_state(self, data):
+        """
+        Восстанавливает частичное состояние из результата dump_state().
+
+        Args:
+            data (list | dict): JSON-совместимое представление состояния
+
+        Returns:
+            object: Состояние отчета
+        """
+        raise NotImplementedError("Метод load_state должен быть реализован в дочернем классе")
+
+
+class KeyedReport(BaseReport):
+    """
+    Базовый класс для отчетов, агрегирующих данные по ключу.
+
+    Состояние таких отчетов - SpillingAggregator, поэтому объединение
+    и сериализация реализованы здесь, а дочерним классам остается
+    реализовать new_state(), update() и finalize().
+    """
+
+    def merge(self, state, other):
         """
-        raise NotImplementedError("Метод generate должен быть реализован в дочернем классе")
+        Объединяет агрегаторы, складывая состояния с одинаковыми ключами.
+
+        Args:
+            state (SpillingAggregator): Агрегатор, в который выполняется объединение
+            other (SpillingAggregator): Объединяемый агрегатор
+
+        Returns:
+            SpillingAggregator: Объединенный агрегатор
+        """
+
+        for key, value in other.items():
+            state.add(key, value)
+        return state
+
+    def dump_state(self, state):
+        """Сериализует агрегатор в список пар [ключ, состояние]."""
+        return state.dump()
+
+    def load_state(self, data):
+        """Восстанавливает агрегатор из списка пар [ключ, состояние]."""
+        state = self.new_state()
+        state.load(data)
+        return state
+
+
+def accumulate_reports(reports, lines):
+    """
+    Обновляет состояния нескольких отчетов за один проход по строкам.
+
+    Каждая строка парсится один раз, записи группируются в пакеты
+    RecordBatch, и каждый пакет передается во все отчеты.
+
+    Args:
+        reports (dict): Словарь {имя: отчет}
+        lines (Iterable[str | bytes]): Строки лога
+
+    Returns:
+        dict: Словарь {имя: частичное состояние отчета}
+    """
+
+    states = {name: report.new_state() for name, report in reports.items()}
+    updates = [(report.update_batch, states[name]) for name, report in reports.items()]
+
+    for batch in iter_batches(lines):
+        for update_batch, state in updates:
+            update_batch(state, batch)
+
+    return states
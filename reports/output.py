@@ -0,0 +1,78 @@
+"""
+Модуль параметров вывода отчетов: форматы и отбор строк.
+
+Модуль импортируется при каждом запуске, поэтому содержит только то,
+что нужно для разбора аргументов и вывода таблиц по умолчанию. Потоковые
+форматы (csv, tempfile и т.д.) импортируются из reports.writers только
+при выборе --format json, csv или openmetrics.
+
+Отбор --top выполняется выбором из кучи (heapq.nlargest/nsmallest) за
+O(n log N) и с памятью O(N) вместо полной сортировки всех строк.
+
+Функции:
+    select(report, data, field, top, ascending): Сортировка и отбор N строк
+
+Использование:
+    from reports.output import select
+
+    data = select(report, report.finalize(state), field="count", top=10)
+"""
+
+import heapq
+from itertools import islice
+
+# Форматы вывода (table - таблицы tabulate из reports.printers,
+# остальные - потоковые форматы из reports.writers)
+FORMATS = ("table", "json", "csv", "openmetrics")
+
+
+def _sort_key(report, field, rows):
+    """Возвращает функцию ключа сортировки для строк или пар (ключ, значение)."""
+    if rows:
+        return lambda row: row[field]
+    if field == report.fields[0]:
+        return lambda item: item[0]
+    return lambda item: item[1][field] if isinstance(item[1], dict) else item[1]
+
+
+def select(report, data, field=None, top=None, ascending=False):
+    """
+    Сортирует данные отчета по полю и оставляет первые top строк.
+
+    Args:
+        report (BaseReport): Отчет, данные которого отбираются
+        data (dict | list | MergedItems): Результат report.finalize()
+        field (str | None): Поле сортировки из report.fields. Если отчет не
+                            содержит поле, используется report.sort_field
+        top (int | None): Количество строк. None - все строки
+        ascending (bool): Сортировка по возрастанию (по умолчанию - по убыванию)
+
+    Returns:
+        dict | list | MergedItems: Данные того же вида, что и data. Без сортировки
+                                   и отбора возвращается сам объект data
+
+    Notes:
+        - С top используется выбор из кучи, полная сортировка не выполняется
+        - Без top строки сортируются целиком (ленивый MergedItems при этом
+          собирается в памяти)
+    """
+
+    if field not in report.fields:
+        if top is None:
+            return data
+        field = report.sort_field
+
+    rows = isinstance(data, list)
+    pairs = data if rows else data.items()
+    if field is None:
+        # Отчет без поля сортировки - первые top строк в исходном порядке
+        selected = list(islice(pairs, top))
+    else:
+        key = _sort_key(report, field, rows)
+        if top is None:
+            selected = sorted(pairs, key=key, reverse=not ascending)
+        elif ascending:
+            selected = heapq.nsmallest(top, pairs, key=key)
+        else:
+            selected = heapq.nlargest(top, pairs, key=key)
+    return selected if rows else dict(selected)
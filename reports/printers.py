@@ -0,0 +1,147 @@
+"""
+Модуль форматирования отчетов в таблицы.
+
+Функции этого модуля преобразуют данные, которые возвращает finalize()
+отчета, в текстовую таблицу. Модуль импортируется только при выводе
+отчета (см. reports.registry), поэтому tabulate не загружается, например,
+при записи снимков --emit-partial или выводе справки.
+
+Функции:
+    print_average(data): Таблица среднего времени ответа по endpoint'ам
+    print_status(data): Таблица статус-кодов
+    print_user_agents(data): Таблица User-Agent'ов
+    print_slowest(data): Таблица самых медленных запросов
+    print_slo(data): Таблица окон, нарушивших SLO
+    print_rows(data): Таблица для отчетов без собственного форматирования
+"""
+
+from tabulate import tabulate
+
+
+def print_average(data):
+    """
+    Формирует таблицу с данными о среднем времени ответа.
+
+    Args:
+        data (dict): Словарь с данными в формате
+                     {url: {"count": int, "avg_time": float, "min_time": float,
+                            "max_time": float, "variance": float, "stddev": float}}
+
+    Returns:
+        str: Отформатированная таблица в виде строки
+    """
+    table = []
+    headers = ["Endpoint", "Запросов", "Ср. время (с)", "Мин. (с)", "Макс. (с)",
+               "Дисперсия", "Ст. откл. (с)"]
+    for url, info in data.items():
+        table.append([
+            url,
+            info["count"],
+            round(info["avg_time"], 3),
+            round(info["min_time"], 3),
+            round(info["max_time"], 3),
+            round(info["variance"], 6),
+            round(info["stddev"], 3),
+        ])
+    return tabulate(table, headers=headers, tablefmt="grid")
+
+
+def print_status(data):
+    """
+    Формирует таблицу со статистикой кодов статуса.
+
+    Args:
+        data (dict): Словарь с данными в формате {status_code: count}
+
+    Returns:
+        str: Отформатированная таблица в виде строки
+        """
+    table = []
+    headers = ["Статус", "Кол-во"]
+    for code, count in data.items():
+        table.append([code, count])
+    return tabulate(table, headers=headers, tablefmt="grid")
+
+
+def print_user_agents(data):
+    """
+    Формирует таблицу с количественной статистикой User-Agent'ов.
+
+    Args:
+        data (dict): Словарь с данными в формате {user_agent: count}
+
+    Returns:
+        str: Отформатированная таблица в виде строки
+    """
+    table = []
+    headers = ["User-Agent", "Кол-во"]
+    for ua, count in data.items():
+        table.append([ua, count])
+    return tabulate(table, headers=headers, tablefmt="grid")
+
+
+def print_slowest(data):
+    """
+    Формирует таблицу с самыми медленными запросами.
+
+    Args:
+        data (list): Список словарей с ключами response_time, timestamp,
+                     url, status и user_agent, отсортированный по убыванию времени
+
+    Returns:
+        str: Отформатированная таблица в виде строки
+    """
+    table = []
+    headers = ["Время (с)", "Timestamp", "Endpoint", "Статус", "User-Agent"]
+    for row in data:
+        table.append([
+            round(row["response_time"], 3),
+            row["timestamp"],
+            row["url"],
+            row["status"],
+            row["user_agent"],
+        ])
+    return tabulate(table, headers=headers, tablefmt="grid")
+
+
+def print_slo(data):
+    """
+    Формирует таблицу с окнами, в которых endpoint нарушил SLO.
+
+    Args:
+        data (list): Список словарей с ключами url, window_start, requests,
+                     errors, slow, error_burn и latency_burn
+
+    Returns:
+        str: Отформатированная таблица в виде строки
+    """
+    table = []
+    headers = ["Endpoint", "Начало окна (UTC)", "Запросов", "5xx", "Медленных",
+               "Burn 5xx", "Burn задержки"]
+    for row in data:
+        table.append([
+            row["url"],
+            row["window_start"],
+            row["requests"],
+            row["errors"],
+            row["slow"],
+            round(row["error_burn"], 2),
+            round(row["latency_burn"], 2),
+        ])
+    return tabulate(table, headers=headers, tablefmt="grid")
+
+
+def print_rows(data):
+    """
+    Формирует таблицу для отчета, который не объявил собственный printer.
+
+    Args:
+        data (dict | list): Словарь {ключ: значение} или список словарей
+                            с одинаковыми ключами
+
+    Returns:
+        str: Отформатированная таблица в виде строки
+    """
+    if isinstance(data, list):
+        return tabulate(data, headers="keys", tablefmt="grid")
+    return tabulate(list(data.items()), headers=["Ключ", "Значение"], tablefmt="grid")
@@ -0,0 +1,190 @@
+"""
+Модуль реестра отчетов с отложенной загрузкой.
+
+Отчет объявляется один раз - строкой "модуль:Класс". Функция
+форматирования объявляется в самом классе атрибутом printer в том же
+формате. Модули отчета и его printer'а импортируются только при первом
+обращении к отчету, поэтому запуск с одним отчетом не загружает остальные
+отчеты и tabulate.
+
+Помимо встроенных отчетов, реестр находит отчеты сторонних пакетов через
+entry points группы "workmate.reports":
+
+    [project.entry-points."workmate.reports"]
+    latency_p99 = "my_package.reports:P99Report"
+
+Entry points просматриваются только при обращении к имени, которого нет
+среди встроенных отчетов, или при переборе всех отчетов (--report all):
+importlib.metadata сам по себе заметно увеличивает время запуска.
+
+Классы:
+    ReportRegistry: Отображение {имя: экземпляр отчета} с отложенным импортом
+    PrinterRegistry: Отображение {имя: функция форматирования} поверх ReportRegistry
+
+Функции:
+    load_object(path): Импорт объекта по строке "модуль:атрибут"
+
+Использование:
+    from reports.registry import ReportRegistry
+
+    reports = ReportRegistry()
+    "status_code" in reports       # True, без импорта модуля отчета
+    report = reports["status_code"]  # импорт reports.status_report
+    table = reports.printers["status_code"](report.generate(lines))
+"""
+
+from collections.abc import Mapping
+from importlib import import_module
+
+# Группа entry points для отчетов сторонних пакетов
+ENTRY_POINT_GROUP = "workmate.reports"
+
+# Встроенные отчеты (расширять при создании новых классов отчетов)
+BUILTIN_REPORTS = {
+    "average": "reports.average_report:AverageReport",
+    "status_code": "reports.status_report:StatusReport",
+    "user_agent": "reports.user_agent_report:UserAgentReport",
+    "slowest": "reports.slowest_report:SlowestReport",
+    "slo": "reports.slo_report:SloReport",
+}
+
+# Функция форматирования для отчетов без атрибута printer
+DEFAULT_PRINTER = "reports.printers:print_rows"
+
+
+def load_object(path):
+    """
+    Импортирует объект по строке "модуль:атрибут".
+
+    Args:
+        path (str): Путь к объекту, например "reports.printers:print_status"
+
+    Returns:
+        object: Найденный объект
+
+    Raises:
+        ValueError: Если строка не в формате "модуль:атрибут"
+        ImportError: Если модуль или атрибут не найден
+    """
+
+    module_name, sep, attribute = path.partition(":")
+    if not sep or not module_name or not attribute:
+        raise ValueError(f"ожидается путь в формате 'модуль:атрибут': {path!r}")
+
+    obj = import_module(module_name)
+    try:
+        for name in attribute.split("."):
+            obj = getattr(obj, name)
+    except AttributeError as error:
+        raise ImportError(f"в модуле {module_name!r} нет атрибута {attribute!r}") from error
+    return obj
+
+
+class ReportRegistry(Mapping):
+    """
+    Реестр отчетов: отображение {имя: экземпляр отчета по умолчанию}.
+
+    Класс отчета импортируется и создается без аргументов при первом
+    обращении по имени; экземпляр кэшируется. Экземпляры с параметрами
+    запуска создаются через type(registry[name]).from_args(args).
+
+    Attributes:
+        group (str | None): Группа entry points. None - только явно
+                            объявленные отчеты
+        printers (PrinterRegistry): Функции форматирования отчетов
+
+    Methods:
+        register(name, path): Объявляет отчет по строке "модуль:Класс"
+    """
+
+    def __init__(self, reports=None, group=ENTRY_POINT_GROUP):
+        """
+        Args:
+            reports (dict | None): Словарь {имя: "модуль:Класс"}.
+                                   None - встроенные отчеты BUILTIN_REPORTS
+            group (str | None): Группа entry points сторонних отчетов
+        """
+        self.group = group
+        self.printers = PrinterRegistry(self)
+        self._paths = dict(BUILTIN_REPORTS if reports is None else reports)
+        self._reports = {}
+        self._discovered = group is None
+
+    def register(self, name, path):
+        """
+        Объявляет отчет. Модуль отчета при этом не импортируется.
+
+        Args:
+            name (str): Имя отчета для --report
+            path (str): Путь к классу отчета в формате "модуль:Класс"
+        """
+        self._paths[name] = path
+        self._reports.pop(name, None)
+
+    def _discover(self):
+        """Добавляет отчеты из entry points (один раз за время жизни реестра)."""
+        if self._discovered:
+            return
+        self._discovered = True
+
+        # Импорт только здесь: importlib.metadata заметно замедляет запуск
+        metadata = import_module("importlib.metadata")
+
+        for entry_point in metadata.entry_points(group=self.group):
+            # Явно объявленные отчеты имеют приоритет над entry points
+            self._paths.setdefault(entry_point.name, entry_point.value)
+
+    def __contains__(self, name):
+        if name in self._paths:
+            return True
+        self._discover()
+        return name in self._paths
+
+    def __getitem__(self, name):
+        report = self._reports.get(name)
+        if report is None:
+            if name not in self:
+                raise KeyError(name)
+            report = load_object(self._paths[name])()
+            self._reports[name] = report
+        return report
+
+    def __iter__(self):
+        self._discover()
+        return iter(list(self._paths))
+
+    def __len__(self):
+        self._discover()
+        return len(self._paths)
+
+
+class PrinterRegistry(Mapping):
+    """
+    Отображение {имя отчета: функция форматирования}.
+
+    Функция берется из атрибута printer класса отчета ("модуль:функция")
+    и импортируется при первом обращении. Отчеты без атрибута printer
+    выводятся через DEFAULT_PRINTER.
+    """
+
+    def __init__(self, reports):
+        """
+        Args:
+            reports (ReportRegistry): Реестр отчетов
+        """
+        self._registry = reports
+        self._printers = {}
+
+    def __getitem__(self, name):
+        printer = self._printers.get(name)
+        if printer is None:
+            path = getattr(self._registry[name], "printer", None) or DEFAULT_PRINTER
+            printer = load_object(path)
+            self._printers[name] = printer
+        return printer
+
+    def __iter__(self):
+        return iter(self._registry)
+
+    def __len__(self):
+        return len(self._registry)
@@ -0,0 +1,446 @@
+"""
+Модуль отчета по SLO и бюджету ошибок endpoint'ов.
+
+Этот модуль предоставляет класс SloReport, который за тот же единственный
+проход по логам, что и остальные отчеты, находит окна времени, в которых
+endpoint нарушил цель по доле ошибок 5xx или по доле медленных запросов,
+и скорость расходования бюджета ошибок (burn rate) в этих окнах.
+
+Для каждого URL хранится кольцевой буфер из фиксированного числа окон
+фиксированной длины: окно с более новым номером вытесняет окно, занимавшее
+ту же ячейку. Вытесненное окно проверяется на нарушение SLO, и окна
+с нарушением сохраняются (не больше max_breaches на URL, с наибольшим burn
+rate). Поэтому память ограничена числом URL, умноженным на windows
+и max_breaches, а отчет описывает весь период логов.
+
+Классы:
+    SloTargets: Длина и число окон, целевые доли ошибок и медленных запросов
+    SloState: Частичное состояние отчета
+    UrlWindows: Буфер окон и вытесненные окна с нарушением одного URL
+    SloReport: Отчет по окнам, нарушившим SLO
+"""
+
+import dataclasses
+import heapq
+from array import array
+from datetime import datetime, timezone
+from functools import partial
+
+from utils.aggregator import SpillingAggregator
+from .base import BaseReport
+
+# Номер окна в пустой ячейке кольцевого буфера
+_EMPTY = -2 ** 63
+
+# Количество значений в ячейке: номер окна, запросы, ошибки 5xx, медленные запросы
+_SLOT = 4
+
+
+@dataclasses.dataclass(frozen=True)
+class SloTargets:
+    """
+    Параметры окон и цели SLO.
+
+    Attributes:
+        window (int): Длина окна в секундах
+        windows (int): Количество окон в кольцевом буфере каждого URL
+        error_rate (float): Допустимая доля ответов 5xx (бюджет ошибок)
+        latency (float): Порог медленного запроса в секундах
+        slow_rate (float): Допустимая доля медленных запросов
+        max_breaches (int): Количество вытесненных из буфера окон с нарушением,
+                            которые хранятся для каждого URL (с наибольшим
+                            burn rate)
+    """
+
+    window: int = 300
+    windows: int = 12
+    error_rate: float = 0.01
+    latency: float = 1.0
+    slow_rate: float = 0.05
+    max_breaches: int = 100
+
+
+class SloState:
+    """
+    Частичное состояние отчета SLO.
+
+    Attributes:
+        rings (SpillingAggregator): Окна URL {url: UrlWindows}
+    """
+
+    __slots__ = ("rings",)
+
+    def __init__(self, rings):
+        self.rings = rings
+
+
+class UrlWindows:
+    """
+    Окна одного URL: кольцевой буфер последних окон и min-куча окон,
+    вытесненных из буфера с нарушением SLO.
+
+    Attributes:
+        ring (array): Ячейки окон (номер окна, запросы, ошибки 5xx, медленные)
+        breaches (list): Min-куча кортежей (burn rate, номер окна, запросы,
+                         ошибки 5xx, медленные запросы)
+    """
+
+    __slots__ = ("ring", "breaches")
+
+    def __init__(self, windows, breaches=None):
+        """
+        Args:
+            windows (int | array): Количество окон в буфере или готовый буфер
+            breaches (list | None): Куча вытесненных окон с нарушением
+        """
+        if isinstance(windows, int):
+            windows = array("q", [_EMPTY, 0, 0, 0] * windows)
+        self.ring = windows
+        self.breaches = breaches if breaches is not None else []
+
+    def __sizeof__(self):
+        # Оценка памяти для SpillingAggregator учитывает буфер окон
+        return object.__sizeof__(self) + self.ring.__sizeof__() + self.breaches.__sizeof__()
+
+    def to_list(self):
+        """Сериализует окна в JSON-совместимый список."""
+        return [self.ring.tolist(), [list(entry) for entry in self.breaches]]
+
+    @classmethod
+    def from_list(cls, data):
+        """Восстанавливает окна из результата to_list()."""
+        ring, breaches = data
+        return cls(array("q", ring), [tuple(entry) for entry in breaches])
+
+
+def _window_index(timestamp, window):
+    """
+    Возвращает номер окна для значения @timestamp.
+
+    Время без часового пояса считается UTC. Для некорректных значений
+    возвращается None.
+    """
+
+    try:
+        moment = datetime.fromisoformat(timestamp)
+    except (TypeError, ValueError):
+        return None
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return int(moment.timestamp()) // window
+
+
+class SloReport(BaseReport):
+    """
+    Класс для генерации отчета по окнам, в которых endpoint нарушил SLO.
+
+    Наследуется от BaseReport. Для каждого URL и окна считаются запросы,
+    ответы 5xx и запросы медленнее targets.latency. Burn rate - отношение
+    фактической доли к допустимой: 1 означает расход бюджета ровно с
+    допустимой скоростью. В отчет попадают окна, где burn rate по ошибкам
+    или по задержке больше 1.
+
+    Окно проверяется в момент вытеснения из кольцевого буфера, и окна
+    с нарушением сохраняются (не больше targets.max_breaches на URL, с
+    наибольшим burn rate), поэтому отчет описывает весь период логов,
+    а не только последние windows окон.
+
+    Attributes:
+        targets (SloTargets): Параметры окон и цели SLO
+        memory_limit (int | None): Лимит памяти окон URL в байтах
+
+    Notes:
+        - Все параметры targets влияют на состояние (номера окон, счетчики
+          медленных запросов и отбор вытесненных окон), поэтому сохраняются
+          в снимке, и load_state() отклоняет снимок с другими значениями
+        - Запись старше окна, занимающего ее ячейку, отбрасывается (как
+          в логах, упорядоченных по времени)
+        - При объединении состояний счетчики окна, вытесненного в обоих,
+          складываются только из тех состояний, где окно нарушило SLO
+
+    Methods:
+        generate(lines): Генерирует отчет с окнами, нарушившими SLO
+        update(state, record): Учитывает одну запись
+        update_batch(state, batch): Учитывает пакет записей
+        from_args(args): Создает отчет по аргументам командной строки
+
+    Использование:
+        from reports.slo_report import SloReport, SloTargets
+
+        report = SloReport(SloTargets(window=60, windows=60, error_rate=0.001))
+        data = report.generate(parsed_lines)
+    """
+
+    printer = "reports.printers:print_slo"
+    fields = ("url", "window_start", "requests", "errors", "slow",
+              "error_burn", "latency_burn", "burn_rate")
+    sort_field = "burn_rate"
+    spills = True
+
+    def __init__(self, targets=None, memory_limit=None):
+        """
+        Args:
+            targets (SloTargets | None): Параметры окон и цели SLO.
+                                         None - значения по умолчанию
+            memory_limit (int | None): Лимит памяти окон URL в байтах
+        """
+        super().__init__(memory_limit=memory_limit)
+        self.targets = targets or SloTargets()
+
+    @classmethod
+    def from_args(cls, args):
+        """Создает отчет с параметрами из аргументов --slo-*."""
+        values = {field.name: getattr(args, f"slo_{field.name}", None)
+                  for field in dataclasses.fields(SloTargets)}
+        targets = SloTargets(**{name: value for name, value in values.items()
+                                if value is not None})
+        return cls(targets, memory_limit=args.memory_limit)
+
+    def new_state(self):
+        """
+        Создает пустое состояние с окнами по URL.
+
+        Returns:
+            SloState: Состояние с агрегатором {url: UrlWindows}
+        """
+
+        rings = SpillingAggregator(partial(UrlWindows, self.targets.windows), self._merge_windows,
+                                   memory_limit=self.memory_limit,
+                                   codec=(UrlWindows.to_list, UrlWindows.from_list))
+        return SloState(rings)
+
+    def _burn_rates(self, counts):
+        """Возвращает burn rate по ошибкам и по задержке для (запросы, ошибки, медленные)."""
+        requests, errors, slow = counts
+        return (errors / requests / self.targets.error_rate,
+                slow / requests / self.targets.slow_rate)
+
+    def _check_window(self, windows, index, counts):
+        """
+        Сохраняет вытесненное окно, если оно нарушило SLO.
+
+        Счетчики окна, уже сохраненного из другого состояния, складываются.
+        В куче остаются не больше targets.max_breaches окон с наибольшим
+        burn rate.
+        """
+
+        heap = windows.breaches
+        for position, entry in enumerate(heap):
+            if entry[1] == index:
+                counts = [total + count for total, count in zip(entry[2:], counts)]
+                heap[position] = heap[-1]
+                heap.pop()
+                heapq.heapify(heap)
+                break
+
+        if not counts[0]:
+            return
+        burn_rate = max(self._burn_rates(counts))
+        if burn_rate <= 1:
+            return
+        entry = (burn_rate, index, *counts)
+        if len(heap) < self.targets.max_breaches:
+            heapq.heappush(heap, entry)
+        elif entry > heap[0]:
+            heapq.heapreplace(heap, entry)
+
+    def _add_window(self, windows, index, counts, check_dropped=False):
+        """
+        Добавляет счетчики окна в кольцевой буфер.
+
+        Окно с большим номером вытесняет окно в той же ячейке (вытесненное
+        окно проверяется на нарушение), счетчики одного окна складываются,
+        а окно старше хранимого отбрасывается.
+
+        Args:
+            windows (UrlWindows): Окна URL
+            index (int): Номер окна
+            counts (Sequence[int]): Количество запросов, ошибок 5xx и медленных запросов
+            check_dropped (bool): Проверять отбрасываемое окно на нарушение
+                                  (при объединении состояний окна полные)
+        """
+
+        ring = windows.ring
+        base = index % (len(ring) // _SLOT) * _SLOT
+        current = ring[base]
+        if current == index:
+            ring[base + 1] += counts[0]
+            ring[base + 2] += counts[1]
+            ring[base + 3] += counts[2]
+        elif current < index:
+            if current != _EMPTY:
+                self._check_window(windows, current, ring[base + 1:base + _SLOT])
+            ring[base:base + _SLOT] = array("q", (index, *counts))
+        elif check_dropped:
+            self._check_window(windows, index, counts)
+
+    def _merge_windows(self, windows, other):
+        """Объединяет окна одного URL из двух состояний."""
+        ring = other.ring
+        for base in range(0, len(ring), _SLOT):
+            index = ring[base]
+            if index != _EMPTY:
+                self._add_window(windows, index, ring[base + 1:base + _SLOT], check_dropped=True)
+        for entry in other.breaches:
+            self._check_window(windows, entry[1], entry[2:])
+        return windows
+
+    def update(self, state, record):
+        """
+        Учитывает запись в окне ее URL.
+
+        Args:
+            state (SloState): Состояние отчета
+            record (LogRecord): Запись лога
+
+        Notes:
+            - Игнорирует записи без URL или с некорректным @timestamp
+        """
+
+        if not record.url:
+            return
+        index = _window_index(record.timestamp, self.targets.window)
+        if index is None:
+            return
+
+        status, rt = record.status, record.response_time
+        self._add_window(state.rings.get(record.url), index, (
+            1,
+            int(status is not None and status >= 500),
+            int(rt is not None and rt > self.targets.latency),
+        ))
+
+    def update_batch(self, state, batch):
+        """
+        Учитывает пакет записей по колонкам urls, timestamps, statuses
+        и response_times.
+
+        Номер окна вычисляется заново только при смене значения @timestamp,
+        которое у соседних записей обычно совпадает.
+
+        Args:
+            state (SloState): Состояние отчета
+            batch (RecordBatch): Пакет записей лога
+        """
+
+        latency = self.targets.latency
+        get = state.rings.get
+        last_timestamp, index = None, None
+
+        for url, timestamp, status, rt in zip(batch.urls, batch.timestamps,
+                                              batch.statuses, batch.response_times):
+            if not url:
+                continue
+            if timestamp != last_timestamp:
+                last_timestamp = timestamp
+                index = _window_index(timestamp, self.targets.window)
+            if index is None:
+                continue
+
+            # То же, что _add_window, без вызова метода и кортежа на запись;
+            # NaN (отсутствующее время ответа) не больше порога
+            windows = get(url)
+            ring = windows.ring
+            base = index % (len(ring) // _SLOT) * _SLOT
+            current = ring[base]
+            if current == index:
+                ring[base + 1] += 1
+                if status >= 500:
+                    ring[base + 2] += 1
+                if rt > latency:
+                    ring[base + 3] += 1
+            elif current < index:
+                if current != _EMPTY:
+                    self._check_window(windows, current, ring[base + 1:base + _SLOT])
+                ring[base] = index
+                ring[base + 1] = 1
+                ring[base + 2] = status >= 500
+                ring[base + 3] = rt > latency
+
+    def merge(self, state, other):
+        """Объединяет окна URL двух состояний."""
+        for url, windows in other.rings.items():
+            state.rings.add(url, windows)
+        return state
+
+    def _row(self, url, index, counts):
+        """Возвращает строку отчета для окна URL."""
+        error_burn, latency_burn = self._burn_rates(counts)
+        start = datetime.fromtimestamp(index * self.targets.window, timezone.utc)
+        return {
+            "url": url,
+            "window_start": start.isoformat(),
+            "requests": counts[0],
+            "errors": counts[1],
+            "slow": counts[2],
+            "error_burn": error_burn,
+            "latency_burn": latency_burn,
+            "burn_rate": max(error_burn, latency_burn),
+        }
+
+    def _breaches(self, url, windows):
+        """Возвращает строки окон URL, нарушивших SLO: из буфера и вытесненных."""
+        ring = windows.ring
+        for base in range(0, len(ring), _SLOT):
+            index, counts = ring[base], ring[base + 1:base + _SLOT]
+            if index != _EMPTY and counts[0] and max(self._burn_rates(counts)) > 1:
+                yield self._row(url, index, counts)
+        for entry in windows.breaches:
+            yield self._row(url, entry[1], entry[2:])
+
+    def finalize(self, state):
+        """
+        Возвращает окна, в которых endpoint нарушил SLO.
+
+        Args:
+            state (SloState): Состояние отчета
+
+        Returns:
+            list: Список словарей, упорядоченный по началу окна и URL:
+                  [
+                      {
+                          "url": str,             # URL запроса
+                          "window_start": str,    # Начало окна (ISO 8601, UTC)
+                          "requests": int,        # Запросов в окне
+                          "errors": int,          # Ответов 5xx
+                          "slow": int,            # Запросов медленнее порога
+                          "error_burn": float,    # Burn rate бюджета ошибок
+                          "latency_burn": float,  # Burn rate бюджета задержки
+                          "burn_rate": float      # Максимальный из двух
+                      }
+                  ]
+
+        Notes:
+            - Учитываются окна всего периода логов; из вытесненных окон URL
+              в отчет попадают не больше targets.max_breaches с наибольшим
+              burn rate
+        """
+
+        rows = [row for url, windows in state.rings.items()
+                for row in self._breaches(url, windows)]
+        rows.sort(key=lambda row: (row["window_start"], row["url"]))
+        return rows
+
+    def _state_targets(self):
+        """Возвращает параметры, от которых зависит содержимое состояния."""
+        return dataclasses.asdict(self.targets)
+
+    def dump_state(self, state):
+        """Сериализует состояние в словарь с параметрами окон и окнами URL."""
+        return {"targets": self._state_targets(), "rings": state.rings.dump()}
+
+    def load_state(self, data):
+        """
+        Восстанавливает состояние из результата dump_state().
+
+        Raises:
+            ValueError: Если состояние создано с другими параметрами targets
+        """
+
+        expected = self._state_targets()
+        if data.get("targets") != expected:
+            raise ValueError(f"состояние отчета slo создано с параметрами {data.get('targets')}, "
+                             f"ожидаются {expected}")
+        state = self.new_state()
+        state.rings.load(data["rings"])
+        return state
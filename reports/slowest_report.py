@@ -0,0 +1,194 @@
+"""
+Модуль отчета по самым медленным запросам.
+
+Этот модуль предоставляет класс SlowestReport, который за тот же
+единственный проход по логам, что и остальные отчеты, находит K самых
+медленных запросов. Используется min-куча фиксированного размера, поэтому
+память O(K), а частичные результаты разных файлов и узлов объединяются.
+"""
+
+import heapq
+import math
+
+from utils.record import MISSING_STATUS
+from .base import BaseReport
+
+# Количество медленных запросов в отчете по умолчанию
+DEFAULT_LIMIT = 10
+
+
+def _entry(rt, timestamp, url, status, user_agent):
+    """
+    Создает кортеж записи для кучи.
+
+    Отсутствующие поля сохраняются пустыми строками, чтобы кортежи
+    кучи всегда были сравнимы.
+    """
+    return (
+        rt,
+        timestamp or "",
+        url,
+        "" if status is None else str(status),
+        user_agent or "",
+    )
+
+
+class SlowestReport(BaseReport):
+    """
+    Класс для генерации отчета по K самым медленным запросам.
+
+    Наследуется от BaseReport. Состояние - min-куча кортежей
+    (response_time, timestamp, url, status, user_agent) размером не более K:
+    в вершине кучи самый быстрый из отобранных запросов, который
+    вытесняется, когда встречается более медленный.
+
+    Attributes:
+        limit (int): Количество запросов в отчете (K)
+        memory_limit (int | None): Не используется - память ограничена K
+
+    Methods:
+        generate(lines): Генерирует отчет с K самыми медленными запросами
+        update(state, record): Учитывает одну запись
+        update_batch(state, batch): Учитывает пакет записей
+        from_args(args): Создает отчет по аргументам командной строки
+
+    Использование:
+        from reports.slowest_report import SlowestReport
+
+        report = SlowestReport(limit=20)
+        data = report.generate(parsed_lines)
+    """
+
+    printer = "reports.printers:print_slowest"
+    fields = ("response_time", "timestamp", "url", "status", "user_agent")
+    sort_field = "response_time"
+
+    def __init__(self, limit=DEFAULT_LIMIT, memory_limit=None):
+        """
+        Args:
+            limit (int): Количество самых медленных запросов в отчете
+            memory_limit (int | None): Лимит памяти (не используется)
+        """
+        super().__init__(memory_limit=memory_limit)
+        self.limit = limit
+
+    @classmethod
+    def from_args(cls, args):
+        """Создает отчет с K из аргумента --slowest (DEFAULT_LIMIT, если не указан)."""
+        return cls(limit=args.slowest or DEFAULT_LIMIT, memory_limit=args.memory_limit)
+
+    def new_state(self):
+        """
+        Создает пустую min-кучу.
+
+        Returns:
+            list: Пустой список для heapq
+        """
+
+        return []
+
+    def _push(self, heap, entry):
+        """Добавляет запись в кучу, сохраняя не более limit самых медленных."""
+        if len(heap) < self.limit:
+            heapq.heappush(heap, entry)
+        elif entry > heap[0]:
+            heapq.heapreplace(heap, entry)
+
+    def update(self, state, record):
+        """
+        Учитывает запись, если она медленнее самой быстрой из отобранных.
+
+        Args:
+            state (list): Min-куча отобранных запросов
+            record (LogRecord): Запись лога
+
+        Notes:
+            - Игнорирует записи без URL или с некорректным временем ответа
+        """
+
+        rt = record.response_time
+        if not record.url or rt is None:
+            return
+
+        # Быстрая проверка до создания кортежа: запрос не попадает в топ
+        if len(state) >= self.limit and rt <= state[0][0]:
+            return
+
+        self._push(state, _entry(rt, record.timestamp, record.url,
+                                 record.status, record.user_agent))
+
+    def update_batch(self, state, batch):
+        """
+        Отбирает медленные запросы пакета по колонке response_times.
+
+        Кортежи записей создаются только для кандидатов, время ответа
+        которых больше минимального в заполненной куче.
+
+        Args:
+            state (list): Min-куча отобранных запросов
+            batch (RecordBatch): Пакет записей лога
+        """
+
+        urls = batch.urls
+        limit = self.limit
+        isnan = math.isnan
+        for i, rt in enumerate(batch.response_times):
+            # NaN - отсутствующее время ответа
+            if isnan(rt) or not urls[i]:
+                continue
+            if len(state) >= limit and rt <= state[0][0]:
+                continue
+            status = batch.statuses[i]
+            self._push(state, _entry(rt, batch.timestamps[i], urls[i],
+                                     None if status == MISSING_STATUS else status,
+                                     batch.user_agents[i]))
+
+    def merge(self, state, other):
+        """Объединяет две кучи, оставляя limit самых медленных запросов."""
+        for entry in other:
+            self._push(state, entry)
+        return state
+
+    def finalize(self, state):
+        """
+        Возвращает отобранные запросы в порядке убывания времени ответа.
+
+        Args:
+            state (list): Min-куча отобранных запросов
+
+        Returns:
+            list: Список словарей в формате:
+                  [
+                      {
+                          "response_time": float,  # Время ответа в секундах
+                          "timestamp": str,        # Значение @timestamp
+                          "url": str,              # URL запроса
+                          "status": str,           # HTTP статус-код
+                          "user_agent": str        # Строка User-Agent
+                      }
+                  ]
+        """
+
+        return [
+            {
+                "response_time": rt,
+                "timestamp": timestamp,
+                "url": url,
+                "status": status,
+                "user_agent": user_agent,
+            }
+            for rt, timestamp, url, status, user_agent in sorted(state, reverse=True)
+        ]
+
+    def dump_state(self, state):
+        """Сериализует кучу в список записей."""
+        return [list(entry) for entry in state]
+
+    def load_state(self, data):
+        """Восстанавливает кучу из списка записей."""
+        state = [tuple(entry) for entry in data]
+        heapq.heapify(state)
+        # Снимок мог быть создан с большим K - оставляем limit самых медленных
+        while len(state) > self.limit:
+            heapq.heappop(state)
+        return state
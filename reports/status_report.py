@@ -6,21 +6,27 @@
 """
 
 from collections import Counter
-from utils.log_parser import _try_parse_json
+
+from utils.record import MISSING_STATUS
 from .base import BaseReport
 
 class StatusReport(BaseReport):
     """
     Класс для генерации отчета по распределению HTTP статус-кодов.
 
-    Наследуется от BaseReport и реализует метод generate() для анализа
+    Наследуется от BaseReport и реализует шаги генерации для анализа
     частоты встречаемости различных HTTP статус-кодов в логах веб-сервера.
 
     Attributes:
-        Нет публичных атрибутов
+        memory_limit (int | None): Не используется - статус-кодов немного
 
     Methods:
         generate(lines): Генерирует отчет со статистикой статус-кодов
+        new_state(): Создает счетчик статус-кодов
+        update(state, record): Учитывает статус-код одной записи
+        update_batch(state, batch): Учитывает статус-коды пакета записей
+        merge(state, other): Складывает счетчики
+        finalize(state): Возвращает распределение статус-кодов
 
     Использование:
         from reports.status_report import StatusReport
@@ -29,17 +35,56 @@ class StatusReport(BaseReport):
         data = report.generate(parsed_lines)
     """
 
-    def generate(self, lines):
+    printer = "reports.printers:print_status"
+    fields = ("status", "count")
+    sort_field = "count"
+
+    def new_state(self):
+        """
+        Создает счетчик статус-кодов.
+
+        Returns:
+            Counter: Пустой счетчик для эффективного подсчета
+        """
+
+        return Counter()
+
+    def update(self, state, record):
+        """
+        Увеличивает счетчик статус-кода записи.
+
+        Args:
+            state (Counter): Счетчик статус-кодов (ключи - int)
+            record (LogRecord): Запись лога
+        """
+
+        if record.status is not None:
+            state[record.status] += 1
+
+    def update_batch(self, state, batch):
+        """
+        Подсчитывает статус-коды по колонке statuses пакета.
+
+        Args:
+            state (Counter): Счетчик статус-кодов (ключи - int)
+            batch (RecordBatch): Пакет записей лога
         """
-        Анализирует логи и подсчитывает количество каждого HTTP статус-кода.
 
-        Обрабатывает каждую строку лога, извлекает статус-код и подсчитывает
-        частоту встречаемости каждого кода с помощью Counter.
+        for code, count in Counter(batch.statuses).items():
+            if code != MISSING_STATUS:
+                state[code] += count
+
+    def merge(self, state, other):
+        """Складывает два счетчика статус-кодов."""
+        state.update(other)
+        return state
+
+    def finalize(self, state):
+        """
+        Возвращает распределение HTTP статус-кодов.
 
         Args:
-           lines (list): Список строк логов. Каждая строка может быть:
-                        - JSON-строкой для парсинга
-                        - Уже распарсенным словарем
+            state (Counter): Счетчик статус-кодов
 
         Returns:
            dict: Словарь с распределением статус-кодов в формате:
@@ -51,28 +96,17 @@ class StatusReport(BaseReport):
                  }
 
         Notes:
-           - Пропускает строки, которые не удается распарсить
            - Конвертирует статус-коды в строки для единообразия
-           - Использует Counter для эффективного подсчета
            - Возвращает обычный dict (не Counter) для сериализации
         """
 
-        # Инициализация счетчика для эффективного подсчета
-        counter = Counter()
-
-        # Обработка каждой строки лога
-        for line in lines:
-            obj = _try_parse_json(line)
-            if not obj:
-                continue
-
-            # Извлечение статус-кода
-            code = obj.get("status")
+        # Возврат обычного словаря со строковыми кодами вместо Counter
+        return {str(code): count for code, count in state.items()}
 
-            # Проверка наличия статус-кода
-            if code is not None:
-                # Конвертация в строку для единообразия и подсчет
-                counter[str(code)] += 1
+    def dump_state(self, state):
+        """Сериализует счетчик в список пар [статус, количество]."""
+        return [[code, count] for code, count in state.items()]
 
-        # Возврат обычного словаря вместо Counter для лучшей сериализации
-        return dict(counter)
+    def load_state(self, data):
+        """Восстанавливает счетчик из списка пар [статус, количество]."""
+        return Counter({int(code): count for code, count in data})
@@ -5,22 +5,28 @@
 распределения User-Agent строк на основе логов веб-сервера.
 """
 
+import operator
 from collections import Counter
-from utils.log_parser import _try_parse_json
-from .base import BaseReport
 
-class UserAgentReport(BaseReport):
+from utils.aggregator import MergedItems, SpillingAggregator
+from .base import KeyedReport
+
+class UserAgentReport(KeyedReport):
     """
     Класс для генерации отчета по распределению User-Agent строк.
 
-    Наследуется от BaseReport и реализует метод generate() для анализа
+    Наследуется от KeyedReport и реализует шаги генерации для анализа
     частоты встречаемости различных User-Agent строк в логах веб-сервера.
 
     Attributes:
-        Нет публичных атрибутов
+        memory_limit (int | None): Лимит памяти для счетчиков User-Agent в байтах
 
     Methods:
         generate(lines): Генерирует отчет со статистикой User-Agent'ов
+        new_state(): Создает счетчик User-Agent'ов
+        update(state, record): Учитывает User-Agent одной записи
+        update_batch(state, batch): Учитывает User-Agent'ы пакета записей
+        finalize(state): Возвращает распределение User-Agent'ов
 
     Использование:
         from reports.user_agent_report import UserAgentReport
@@ -29,21 +35,63 @@ class UserAgentReport(BaseReport):
         data = report.generate(parsed_lines)
     """
 
-    def generate(self, lines):
+    printer = "reports.printers:print_user_agents"
+    fields = ("user_agent", "count")
+    sort_field = "count"
+    spills = True
+
+    def new_state(self):
+        """
+        Создает счетчик User-Agent'ов с ограничением памяти.
+
+        Returns:
+            SpillingAggregator: Агрегатор {user_agent: count}
+        """
+
+        return SpillingAggregator(int, operator.add, memory_limit=self.memory_limit)
+
+    def update(self, state, record):
+        """
+        Увеличивает счетчик User-Agent'а записи.
+
+        Args:
+            state (SpillingAggregator): Счетчик User-Agent'ов
+            record (LogRecord): Запись лога
+
+        Notes:
+            - Учитывает только непустые User-Agent строки
+            - Сохраняет оригинальные User-Agent строки без модификации
+        """
+
+        if record.user_agent:
+            state.add(record.user_agent, 1)
+
+    def update_batch(self, state, batch):
+        """
+        Подсчитывает User-Agent'ы пакета и добавляет их в счетчик.
+
+        Предварительный подсчет через Counter выполняется в C и сокращает
+        количество обращений к агрегатору до числа различных значений в пакете.
+
+        Args:
+            state (SpillingAggregator): Счетчик User-Agent'ов
+            batch (RecordBatch): Пакет записей лога
         """
-        Анализирует логи и подсчитывает количество каждого User-Agent.
 
-        Обрабатывает каждую строку лога, извлекает User-Agent строку и
-        подсчитывает частоту встречаемости каждого уникального User-Agent'а
-        с помощью Counter.
+        add = state.add
+        for ua, count in Counter(batch.user_agents).items():
+            if ua:
+                add(ua, count)
+
+    def finalize(self, state):
+        """
+        Возвращает распределение User-Agent строк.
 
         Args:
-            lines (list): Список строк логов. Каждая строка может быть:
-                         - JSON-строкой для парсинга
-                         - Уже распарсенным словарем
+            state (SpillingAggregator): Счетчик User-Agent'ов
 
         Returns:
-            dict: Словарь с распределением User-Agent строк в формате:
+            dict | MergedItems: Словарь с распределением User-Agent строк в формате:
                   {
                       "user_agent_string": count,  # Количество occurrences
                       "Mozilla/5.0...": 450,
@@ -51,31 +99,13 @@ class UserAgentReport(BaseReport):
                   }
 
         Notes:
-            - Пропускает строки, которые не удается распарсить
-            - Учитывает только непустые User-Agent строки
-            - Сохраняет оригинальные User-Agent строки без модификации
-            - Использует Counter для эффективного подсчета
-            - Возвращает обычный dict (не Counter) для сериализации
+            - Возвращает обычный dict для сериализации, а при сбросе данных
+              на диск (memory_limit) - ленивый MergedItems, отсортированный по ключу
             - Полезен для анализа клиентского ПО, браузеров и ботов
         """
 
-        # Инициализация счетчика для эффективного подсчета
-        counter = Counter()
-
-        # Обработка каждой строки лога
-        for line in lines:
-            # Парсинг JSON или использование готового словаря
-            obj = _try_parse_json(line)
-            if not obj:
-                continue
-
-            # Извлечение User-Agent строки
-            ua = obj.get("http_user_agent")
-
-            # Проверка наличия и непустоты User-Agent
-            if ua:
-                # Подсчет вхождения User-Agent
-                counter[ua] += 1
-
-        # Возврат обычного словаря вместо Counter для лучшей сериализации
-        return dict(counter)
+        # Возврат обычного словаря (или ленивого результата слияния)
+        items = state.items()
+        if isinstance(items, MergedItems):
+            return items
+        return dict(items)
@@ -0,0 +1,228 @@
+"""
+Модуль потоковых машиночитаемых форматов вывода.
+
+Таблица tabulate собирается в памяти целиком и не разбирается
+автоматически, поэтому для больших отчетов и для мониторинга данные
+выводятся построчно в одном из форматов:
+
+    json        - JSON Lines: один объект на строку с ключом "report"
+    csv         - CSV с заголовком из полей отчета; отчеты разделяются
+                  пустой строкой
+    openmetrics - текстовый формат OpenMetrics (Prometheus): числовые поля
+                  становятся gauge-метриками, строковые - метками
+
+Строки берутся из данных finalize() отчета без промежуточного списка,
+в том числе из ленивого MergedItems после сброса агрегатов на диск.
+Модуль импортируется только для этих форматов; отбор строк --sort/--top
+и список форматов находятся в reports.output.
+
+Функции:
+    iter_rows(report, data): Строки данных отчета в виде словарей
+    write_json(out, results): Вывод в формате JSON Lines
+    write_csv(out, results): Вывод в формате CSV
+    write_openmetrics(out, results): Вывод в формате OpenMetrics
+
+Использование:
+    from reports.output import select
+    from reports.writers import WRITERS
+
+    data = select(report, report.finalize(state), field="count", top=10)
+    WRITERS["json"](sys.stdout, [("average", report, data)])
+"""
+
+import csv
+import json
+import math
+import re
+import shutil
+import tempfile
+from contextlib import ExitStack
+from itertools import chain
+
+# Префикс имен метрик OpenMetrics
+METRIC_PREFIX = "workmate"
+
+# Размер буфера метрик в памяти, после которого он переносится во временный файл
+_SPOOL_SIZE = 1024 * 1024
+
+# Символы, недопустимые в именах метрик и меток
+_INVALID_NAME = re.compile(r"[^a-zA-Z0-9_]")
+
+
+def iter_rows(report, data):
+    """
+    Возвращает строки данных отчета в виде словарей.
+
+    Args:
+        report (BaseReport): Отчет; первое поле report.fields - имя ключа
+                             словаря данных, второе - имя скалярного значения
+        data (dict | list | MergedItems): Результат report.finalize()
+
+    Yields:
+        dict: Строка {поле: значение}
+    """
+
+    if isinstance(data, list):
+        yield from data
+        return
+
+    key_field, value_field = report.fields[0], report.fields[1]
+    for key, value in data.items():
+        if isinstance(value, dict):
+            yield {key_field: key, **value}
+        else:
+            yield {key_field: key, value_field: value}
+
+
+def write_json(out, results):
+    """
+    Выводит строки отчетов в формате JSON Lines.
+
+    Args:
+        out (TextIO): Поток вывода
+        results (Iterable[tuple]): Тройки (имя отчета, отчет, данные)
+    """
+
+    for name, report, data in results:
+        for row in iter_rows(report, data):
+            out.write(json.dumps({"report": name, **row}, ensure_ascii=False))
+            out.write("\n")
+
+
+def write_csv(out, results):
+    """
+    Выводит строки отчетов в формате CSV.
+
+    Для каждого отчета выводится заголовок из report.fields; блоки
+    нескольких отчетов разделяются пустой строкой.
+
+    Args:
+        out (TextIO): Поток вывода
+        results (Iterable[tuple]): Тройки (имя отчета, отчет, данные)
+    """
+
+    for index, (_, report, data) in enumerate(results):
+        if index:
+            out.write("\n")
+        writer = csv.DictWriter(out, fieldnames=report.fields, extrasaction="ignore",
+                                lineterminator="\n")
+        writer.writeheader()
+        writer.writerows(iter_rows(report, data))
+
+
+def _metric_name(*parts):
+    """Собирает имя метрики или метки из допустимых символов."""
+    return _INVALID_NAME.sub("_", "_".join(parts))
+
+
+def _metric_value(value):
+    """Форматирует число в формате OpenMetrics."""
+    if isinstance(value, int):
+        return str(value)
+    if math.isnan(value):
+        return "NaN"
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(value)
+
+
+def _label_value(value):
+    """Экранирует значение метки OpenMetrics."""
+    text = "" if value is None else str(value)
+    return text.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _is_number(value):
+    """Проверяет, что значение - число (но не bool)."""
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _write_family_header(out, metric, name, field):
+    """Выводит описание семейства метрик."""
+    out.write(f"# TYPE {metric} gauge\n")
+    out.write(f"# HELP {metric} Поле {field} отчета {name}\n")
+
+
+def _label_text(row, labels, rank):
+    """Форматирует метки строки; rank добавляется для отчетов-списков."""
+    pairs = [f'{_metric_name(field)}="{_label_value(row.get(field))}"' for field in labels]
+    if rank is not None:
+        pairs.append(f'rank="{rank}"')
+    return ",".join(pairs)
+
+
+def _write_samples(targets, row, labels, rank):
+    """Выводит значения числовых полей строки в потоки их семейств метрик."""
+    label_text = _label_text(row, labels, rank)
+    for field, (metric, target) in targets.items():
+        value = row.get(field)
+        if _is_number(value):
+            target.write(f"{metric}{{{label_text}}} {_metric_value(value)}\n")
+
+
+def _write_report_metrics(out, name, report, data):
+    """
+    Выводит метрики одного отчета.
+
+    Семейства метрик в OpenMetrics не должны перемежаться, поэтому
+    первое семейство выводится сразу, а остальные накапливаются во
+    временных файлах (в памяти до _SPOOL_SIZE) и дописываются после.
+    """
+
+    rows = iter_rows(report, data)
+    first = next(rows, None)
+    if first is None:
+        return
+
+    numeric = [field for field in report.fields if _is_number(first.get(field))]
+    if not numeric:
+        return
+    labels = [field for field in report.fields if field not in numeric]
+
+    with ExitStack() as stack:
+        targets = {
+            field: (
+                _metric_name(METRIC_PREFIX, name, field),
+                out if index == 0 else stack.enter_context(
+                    tempfile.SpooledTemporaryFile(_SPOOL_SIZE, mode="w+", encoding="utf-8")
+                ),
+            )
+            for index, field in enumerate(numeric)
+        }
+
+        _write_family_header(out, targets[numeric[0]][0], name, numeric[0])
+        for rank, row in enumerate(chain([first], rows), 1):
+            # Строки списка (например, slowest) различаются по номеру строки
+            _write_samples(targets, row, labels, rank if isinstance(data, list) else None)
+
+        for field in numeric[1:]:
+            metric, spool = targets[field]
+            _write_family_header(out, metric, name, field)
+            spool.seek(0)
+            shutil.copyfileobj(spool, out)
+
+
+def write_openmetrics(out, results):
+    """
+    Выводит отчеты в текстовом формате OpenMetrics.
+
+    Каждое числовое поле отчета - семейство gauge-метрик
+    workmate_<отчет>_<поле>, строковые поля - метки. Вывод завершается
+    строкой "# EOF".
+
+    Args:
+        out (TextIO): Поток вывода
+        results (Iterable[tuple]): Тройки (имя отчета, отчет, данные)
+    """
+
+    for name, report, data in results:
+        _write_report_metrics(out, name, report, data)
+    out.write("# EOF\n")
+
+
+# Потоковые форматы вывода {формат: функция}
+WRITERS = {
+    "json": write_json,
+    "csv": write_csv,
+    "openmetrics": write_openmetrics,
+}
@@ -0,0 +1,29 @@
+"""
+Общие фикстуры pytest для тестов отчетов.
+
+Фикстуры:
+- average_data - данные отчета average для тестов отбора и вывода
+"""
+
+import pytest
+
+
+@pytest.fixture
+def average_data():
+    """
+    Фикстура с данными отчета average.
+
+    Returns:
+        dict: Данные в формате AverageReport.finalize()
+    """
+
+    def summary(count, avg_time):
+        return {"count": count, "avg_time": avg_time, "min_time": avg_time,
+                "max_time": avg_time, "variance": 0.0, "stddev": 0.0}
+
+    return {
+        "/a": summary(5, 0.1),
+        "/b": summary(50, 0.3),
+        "/c": summary(1, 0.9),
+        "/d": summary(20, 0.2),
+    }
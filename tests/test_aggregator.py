@@ -0,0 +1,157 @@
+"""
+Тесты для модуля aggregator.
+
+Этот модуль содержит unit-тесты для агрегации с ограничением памяти:
+- parse_memory_limit - разбор лимита памяти из командной строки
+- SpillingAggregator - сброс частей на диск и k-way слияние
+- AverageReport / UserAgentReport - точность результатов при сбросе на диск
+"""
+
+import io
+import operator
+import tempfile
+import pytest
+from reports.average_report import AverageReport
+from reports.user_agent_report import UserAgentReport
+from utils.aggregator import MergedItems, SpillingAggregator, parse_memory_limit
+
+
+@pytest.mark.parametrize("value, expected", [
+    ("1024", 1024),
+    ("64K", 64 * 1024),
+    ("512M", 512 * 1024 ** 2),
+    ("2g", 2 * 1024 ** 3),
+    ("1.5GB", int(1.5 * 1024 ** 3)),
+])
+def test_parse_memory_limit(value, expected):
+    """
+    Тестирует разбор лимита памяти с суффиксами и без.
+
+    Args:
+        value: Строка лимита
+        expected: Ожидаемое количество байт
+    """
+
+    assert parse_memory_limit(value) == expected
+
+
+@pytest.mark.parametrize("value", ["", "abc", "0", "-1M"])
+def test_parse_memory_limit_invalid(value):
+    """
+    Тестирует, что некорректный лимит приводит к ValueError.
+
+    Args:
+        value: Некорректная строка лимита
+    """
+
+    with pytest.raises(ValueError):
+        parse_memory_limit(value)
+
+
+def test_aggregator_without_limit_keeps_dict():
+    """
+    Тестирует, что без лимита агрегатор не сбрасывает данные на диск.
+    """
+
+    agg = SpillingAggregator(int, operator.add)
+    for key in ["b", "a", "b"]:
+        agg.add(key, 1)
+
+    assert agg.spilled_runs == 0
+    assert dict(agg.items()) == {"a": 1, "b": 2}
+
+
+def test_aggregator_spills_and_merges_exactly():
+    """
+    Тестирует, что при маленьком лимите данные сбрасываются на диск,
+    а результат слияния точный и отсортирован по ключу.
+    """
+
+    agg = SpillingAggregator(int, operator.add, memory_limit=2048)
+    expected = {}
+    for i in range(3000):
+        key = f"/api/{i % 500}"
+        agg.add(key, 1)
+        expected[key] = expected.get(key, 0) + 1
+
+    assert agg.spilled_runs > 0
+    items = agg.items()
+    assert isinstance(items, MergedItems)
+
+    merged = list(items)
+    assert [key for key, _ in merged] == sorted(expected)
+    assert dict(merged) == expected
+
+
+class _CountingFile(io.StringIO):
+    """Временный файл в памяти, подсчитывающий объем записанных данных."""
+
+    written = 0
+
+    def write(self, s):
+        _CountingFile.written += len(s)
+        return super().write(s)
+
+
+def test_aggregator_tiered_merge(monkeypatch):
+    """
+    Тестирует, что при тысячах сбросов части сливаются по уровням:
+    открытых частей мало, а объем записи на диск растет как N log N,
+    а не квадратично (каждое слияние не переписывает все данные).
+
+    Args:
+        monkeypatch: Встроенная фикстура pytest для подмены tempfile
+    """
+
+    monkeypatch.setattr(_CountingFile, "written", 0)
+    monkeypatch.setattr(tempfile, "TemporaryFile", lambda *args, **kwargs: _CountingFile())
+
+    agg = SpillingAggregator(int, operator.add, memory_limit=512)
+    expected = {}
+    for i in range(20000):
+        key = f"/api/{i * 7919 % 5000}"
+        agg.add(key, 1)
+        expected[key] = expected.get(key, 0) + 1
+
+    assert agg.spilled_runs < 3 * 16
+    merged = dict(agg.items())
+    assert merged == expected
+
+    # Слияние всех частей при каждом 64-м сбросе записывало ~140 объемов результата
+    result_size = sum(len(f'["{key}", {count}]\n') for key, count in merged.items())
+    assert _CountingFile.written < 30 * result_size
+
+
+def test_average_report_with_memory_limit_matches_unlimited():
+    """
+    Тестирует, что AverageReport со сбросом на диск дает тот же результат,
+    что и без ограничения памяти.
+    """
+
+    lines = [
+        f'{{"url": "/api/{i % 300}", "response_time": {(i % 7) / 10}}}'
+        for i in range(2000)
+    ]
+
+    expected = AverageReport().generate(lines)
+    result = AverageReport(memory_limit=4096).generate(lines)
+
+    assert isinstance(result, MergedItems)
+    result = dict(result.items())
+    assert result.keys() == expected.keys()
+    for url, data in expected.items():
+        assert result[url]["count"] == data["count"]
+        assert result[url]["avg_time"] == pytest.approx(data["avg_time"])
+
+
+def test_user_agent_report_with_memory_limit_matches_unlimited():
+    """
+    Тестирует, что UserAgentReport со сбросом на диск дает точные счетчики.
+    """
+
+    lines = [f'{{"http_user_agent": "agent-{i % 250}"}}' for i in range(1000)]
+
+    expected = UserAgentReport().generate(lines)
+    result = UserAgentReport(memory_limit=2048).generate(lines)
+
+    assert dict(result.items()) == expected
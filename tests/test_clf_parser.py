@@ -0,0 +1,123 @@
+"""
+Тесты для модуля clf_parser.
+
+Этот модуль содержит unit-тесты для разбора логов формата combined/common:
+- detect_format - определение формата по первой непустой строке
+- parse_clf - разбор строки в словарь с ключами JSON логов
+- clf_date - дата из метки времени в байтах
+
+Модуль использует pytest для создания тестов.
+"""
+
+import pytest
+from utils.clf_parser import CLF_DATE, clf_date, detect_format, parse_clf
+
+COMMON = '10.0.0.1 - - [22/Jun/2025:13:57:32 +0300] "GET /api/users?id=1 HTTP/1.1" 200 512'
+COMBINED = COMMON + ' "https://example.com/" "Mozilla/5.0 (X11; Linux)"'
+
+
+@pytest.mark.parametrize("lines, expected", [
+    (["", "  \n", COMBINED], "clf"),
+    ([COMMON.encode()], "clf"),
+    (['{"url": "/api/users"}'], "json"),
+    (["invalid line"], "json"),
+    (["", "\n"], None),
+    # Некорректный запрос в начале файла не определяет формат
+    (['10.0.0.1 - - [22/Jun/2025:13:57:32 +0000] "-" 400 0 "-" "-"', COMBINED], "clf"),
+    (["garbage", COMMON, COMMON, '{"url": "/api/users"}'], "clf"),
+    ([COMMON, '{"url": "/a"}', '{"url": "/b"}'], "json"),
+])
+def test_detect_format(lines, expected):
+    """
+    Тестирует определение формата по большинству первых непустых строк.
+
+    Args:
+        lines: Строки начала файла
+        expected: Ожидаемый формат
+    """
+
+    assert detect_format(lines) == expected
+
+
+def test_parse_clf_combined():
+    """
+    Тестирует разбор строки combined с временем ответа в конце строки.
+    """
+
+    assert parse_clf(COMBINED + " 0.125\n") == {
+        "@timestamp": "2025-06-22T13:57:32+03:00",
+        "status": 200,
+        "url": "/api/users?id=1",
+        "request_method": "GET",
+        "response_time": 0.125,
+        "http_user_agent": "Mozilla/5.0 (X11; Linux)",
+    }
+
+
+@pytest.mark.parametrize("line, expected", [
+    # Формат main в nginx: после User-Agent следует "$http_x_forwarded_for"
+    (COMMON + ' "-" "curl/7.68" "-"\n', ("/api/users?id=1", 200, "curl/7.68", None)),
+    # Некорректный запрос или TLS-проба: статус без URL
+    ('10.0.0.1 - - [22/Jun/2025:13:57:32 +0000] "-" 400 0 "-" "-"', (None, 400, "-", None)),
+    # $request_time, затем $upstream_response_time
+    (COMBINED + ' "-" 0.123 0.120\r\n', ("/api/users?id=1", 200, "Mozilla/5.0 (X11; Linux)", 0.123)),
+])
+def test_parse_clf_nginx_variants(line, expected):
+    """
+    Тестирует разбор строк nginx с дополнительными полями в кавычках,
+    с запросом "-" и с несколькими числами в конце строки.
+
+    Args:
+        line: Строка лога
+        expected: Ожидаемые url, status, http_user_agent и response_time
+    """
+
+    record = parse_clf(line)
+    assert (record["url"], record["status"], record["http_user_agent"],
+            record["response_time"]) == expected
+
+
+def test_parse_clf_common_bytes():
+    """
+    Тестирует разбор строки common в байтах: без User-Agent и времени ответа.
+    """
+
+    record = parse_clf(COMMON.encode() + b"\n")
+
+    assert record["url"] == "/api/users?id=1"
+    assert record["status"] == 200
+    assert record["http_user_agent"] is None
+    assert record["response_time"] is None
+
+
+@pytest.mark.parametrize("line", [
+    "invalid line",
+    '{"url": "/api/users"}',
+    '10.0.0.1 - - [22/Jun/2025:13:57:32 +0000] "GET /api/users HTTP/1.1" abc 512',
+])
+def test_parse_clf_invalid(line):
+    """
+    Тестирует, что строки другого формата не разбираются.
+
+    Args:
+        line: Строка лога
+    """
+
+    assert parse_clf(line) is None
+
+
+def test_parse_clf_invalid_timestamp():
+    """
+    Тестирует, что некорректная метка времени дает @timestamp None.
+    """
+
+    assert parse_clf(COMMON.replace("Jun", "Foo"))["@timestamp"] is None
+
+
+def test_clf_date():
+    """
+    Тестирует получение даты YYYY-MM-DD из метки времени в байтах.
+    """
+
+    assert clf_date(CLF_DATE.search(COMMON.encode())) == "2025-06-22"
+    assert clf_date(CLF_DATE.search(b"[22/Foo/2025:13:57:32 +0000]")) is None
@@ -0,0 +1,179 @@
+"""
+Тесты для модуля file_selector.
+
+Этот модуль содержит unit-тесты для выбора файлов логов:
+- expand_paths - раскрытие директорий и glob-шаблонов
+- file_date_range - даты первой и последней записи по началу и концу файла
+- prune_files - пропуск файлов вне запрашиваемой даты
+"""
+
+import gzip
+import pytest
+from utils.file_selector import expand_paths, file_date_range, prune_files
+
+
+def _write_log(path, dates, padding=0):
+    """
+    Записывает лог с одной записью на каждую дату.
+
+    Args:
+        path: Путь к файлу
+        dates: Список дат YYYY-MM-DD в порядке записи
+        padding: Количество записей без даты между первой и последней
+    """
+
+    lines = [f'{{"@timestamp": "{dates[0]}T00:00:00+00:00", "url": "/first"}}']
+    lines += ['{"url": "/padding", "response_time": 0.1}'] * padding
+    lines += [f'{{"@timestamp": "{date}T12:00:00+00:00", "url": "/next"}}' for date in dates[1:]]
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+
+@pytest.fixture
+def rotated_logs(tmp_path):
+    """
+    Фикстура с ротированными логами за несколько дней.
+
+    Returns:
+        pathlib.Path: Директория с файлами access.log, access.log.1, access.log.2
+    """
+
+    _write_log(tmp_path / "access.log", ["2025-06-22", "2025-06-23"])
+    _write_log(tmp_path / "access.log.1", ["2025-06-21", "2025-06-21"])
+    _write_log(tmp_path / "access.log.2", ["2025-06-19", "2025-06-20"])
+    (tmp_path / ".hidden").write_text("", encoding="utf-8")
+    return tmp_path
+
+
+def test_expand_paths_directory_and_glob(rotated_logs):
+    """
+    Тестирует раскрытие директории и glob-шаблона без дубликатов.
+
+    Args:
+        rotated_logs: Фикстура с директорией логов
+    """
+
+    names = ["access.log", "access.log.1", "access.log.2"]
+    expected = [str(rotated_logs / name) for name in names]
+
+    assert expand_paths([str(rotated_logs)]) == expected
+    assert expand_paths([str(rotated_logs / "access.log*")]) == expected
+    assert expand_paths([expected[1], str(rotated_logs / "access.log*")]) == \
+        [expected[1], expected[0], expected[2]]
+    assert expand_paths(["missing.log"]) == ["missing.log"]
+
+
+def test_file_date_range_reads_head_and_tail(tmp_path):
+    """
+    Тестирует определение дат по началу и концу большого файла.
+
+    Args:
+        tmp_path: Встроенная фикстура pytest с временной директорией
+    """
+
+    path = tmp_path / "big.log"
+    _write_log(path, ["2025-06-20", "2025-06-22"], padding=5000)
+
+    assert file_date_range(str(path)) == ("2025-06-20", "2025-06-22")
+
+
+def test_file_date_range_gzip_head_only(tmp_path):
+    """
+    Тестирует, что для сжатого файла определяется только первая дата.
+
+    Args:
+        tmp_path: Встроенная фикстура pytest с временной директорией
+    """
+
+    plain = tmp_path / "access.log"
+    _write_log(plain, ["2025-06-20", "2025-06-22"])
+    compressed = tmp_path / "access.log.gz"
+    with gzip.open(compressed, "wb") as f:
+        f.write(plain.read_bytes())
+
+    assert file_date_range(str(compressed)) == ("2025-06-20", None)
+
+
+@pytest.mark.parametrize("filter_date, expected", [
+    ("2025-06-23", ["access.log"]),
+    ("2025-06-21", ["access.log.1"]),
+    ("2025-06-20", ["access.log.2"]),
+    ("2025-06-01", []),
+    (None, ["access.log", "access.log.1", "access.log.2"]),
+])
+def test_prune_files(rotated_logs, filter_date, expected):
+    """
+    Тестирует пропуск файлов, диапазон дат которых не покрывает фильтр.
+
+    Args:
+        rotated_logs: Фикстура с директорией логов
+        filter_date: Дата фильтра
+        expected: Имена файлов, которые должны быть прочитаны
+    """
+
+    files = expand_paths([str(rotated_logs)])
+    assert prune_files(files, filter_date) == [str(rotated_logs / name) for name in expected]
+
+
+def test_prune_files_keeps_unknown(tmp_path):
+    """
+    Тестирует, что файлы без @timestamp и отсутствующие файлы не пропускаются.
+
+    Args:
+        tmp_path: Встроенная фикстура pytest с временной директорией
+    """
+
+    path = tmp_path / "plain.log"
+    path.write_text('{"url": "/api"}\n', encoding="utf-8")
+    missing = str(tmp_path / "missing.log")
+
+    assert prune_files([str(path), missing], "2025-06-22") == [str(path), missing]
+
+
+def test_file_date_range_clf(tmp_path):
+    """
+    Тестирует определение дат для лога формата combined/common.
+
+    Args:
+        tmp_path: Встроенная фикстура pytest с временной директорией
+    """
+
+    path = tmp_path / "access.log"
+    path.write_text(
+        '10.0.0.1 - - [20/Jun/2025:23:59:59 +0000] "GET /a HTTP/1.1" 200 1\n'
+        '10.0.0.1 - - [22/Jun/2025:00:00:01 +0000] "GET /b HTTP/1.1" 200 1\n',
+        encoding="utf-8",
+    )
+
+    assert file_date_range(str(path)) == ("2025-06-20", "2025-06-22")
+    assert not prune_files([str(path)], "2025-06-23")
+
+
+def test_prune_files_gzip_rotations(tmp_path):
+    """
+    Тестирует отбор сжатых файлов серии ротации: последняя дата .gz
+    ограничивается первой датой более нового файла, поэтому из 30 дней
+    читаются только файлы, которые могут содержать запрошенную дату.
+
+    Args:
+        tmp_path: Встроенная фикстура pytest с временной директорией
+    """
+
+    _write_log(tmp_path / "access.log", ["2025-06-30", "2025-06-30"])
+    for number in range(1, 30):
+        date = f"2025-06-{30 - number:02d}"
+        plain = tmp_path / "plain.log"
+        _write_log(plain, [date, date])
+        with gzip.open(tmp_path / f"access.log.{number}.gz", "wb") as f:
+            f.write(plain.read_bytes())
+        plain.unlink()
+
+    files = expand_paths([str(tmp_path / "access.log*")])
+    assert len(files) == 30
+    assert prune_files(files, "2025-06-20") == [
+        str(tmp_path / "access.log.10.gz"),
+        str(tmp_path / "access.log.11.gz"),
+    ]
+    assert prune_files(files, "2025-06-30") == [
+        str(tmp_path / "access.log"),
+        str(tmp_path / "access.log.1.gz"),
+    ]
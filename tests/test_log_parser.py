@@ -3,15 +3,20 @@
 
 Этот модуль содержит unit-тесты для функций парсера логов:
 - _try_parse_json - тестирование парсинга JSON строк
-- load_lines - тестирование загрузки и фильтрации логов
+- load_lines - тестирование загрузки и фильтрации логов (текстовый, байтовый и mmap режимы)
+- _iter_line_blocks - тестирование разбиения блоков на строки
+- _iter_mmap_blocks - тестирование чтения через отображение файла в память
+- load_lines для логов формата combined/common - определение формата по файлу
 
 Модуль использует pytest для создания тестов и временных файлов.
 """
 
+import gzip
+import mmap
 import tempfile
 import os
 import pytest
-from utils.log_parser import _try_parse_json, load_lines
+from utils.log_parser import _iter_line_blocks, _iter_mmap_blocks, _try_parse_json, load_lines
 
 
 @pytest.fixture
@@ -121,3 +126,247 @@ def test_load_lines_no_filter_correct(temp_log_file):
 
     lines = list(load_lines([temp_log_file]))
     assert len(lines) == 4
+
+def test_load_lines_bytes_matches_text(temp_log_file):
+    """
+    Тестирует, что байтовый режим возвращает те же строки, что и текстовый.
+
+    Строки в байтовом режиме - bytes без символа перевода строки.
+
+    Args:
+        temp_log_file: Фикстура с путем к временному файлу логов
+    """
+
+    text_lines = list(load_lines([temp_log_file]))
+    byte_lines = list(load_lines([temp_log_file], reader="bytes"))
+
+    assert all(isinstance(line, bytes) for line in byte_lines)
+    assert [line.decode("utf-8") for line in byte_lines] == [line.rstrip("\n") for line in text_lines]
+
+@pytest.mark.parametrize("filter_date, expected", [
+    ("2025-06-22", 2),
+    ("2025-06-23", 1),
+    ("2021-01-01", 0),
+])
+def test_load_lines_bytes_with_date_filter(temp_log_file, filter_date, expected):
+    """
+    Тестирует фильтрацию по дате в байтовом режиме (без разбора JSON).
+
+    Args:
+        temp_log_file: Фикстура с путем к временному файлу логов
+        filter_date: Дата фильтра
+        expected: Ожидаемое количество строк
+    """
+
+    lines = list(load_lines([temp_log_file], filter_date=filter_date, reader="bytes"))
+    assert len(lines) == expected
+    assert all(f'"@timestamp": "{filter_date}'.encode() in line for line in lines)
+
+def test_load_lines_bytes_block_boundaries(tmp_path):
+    """
+    Тестирует разбиение на строки при границе блока внутри строки,
+    пустые строки и последнюю строку без перевода строки.
+
+    Args:
+        tmp_path: Встроенная фикстура pytest с временной директорией
+    """
+
+    path = tmp_path / "access.log"
+    lines = [f'{{"url": "/api/{i}"}}' for i in range(1000)]
+    path.write_text("\n  \n".join(lines), encoding="utf-8")
+
+    with open(path, "rb") as f:
+        chunks = [line for block in _iter_line_blocks(f, block_size=7)
+                  for line in block if line.strip()]
+
+    assert [line.decode() for line in chunks] == lines
+    assert len(list(load_lines([str(path)], reader="bytes"))) == 1000
+
+def test_load_lines_mmap_matches_bytes(temp_log_file):
+    """
+    Тестирует, что чтение через mmap совпадает с байтовым режимом,
+    в том числе с фильтрацией по дате.
+
+    Args:
+        temp_log_file: Фикстура с путем к временному файлу логов
+    """
+
+    assert list(load_lines([temp_log_file], reader="mmap")) == \
+        list(load_lines([temp_log_file], reader="bytes"))
+    assert list(load_lines([temp_log_file], "2025-06-22", reader="mmap")) == \
+        list(load_lines([temp_log_file], "2025-06-22", reader="bytes"))
+
+def test_iter_mmap_blocks_boundaries(tmp_path):
+    """
+    Тестирует выравнивание блоков mmap по переводу строки, включая
+    строки длиннее блока и последнюю строку без перевода строки.
+
+    Args:
+        tmp_path: Встроенная фикстура pytest с временной директорией
+    """
+
+    path = tmp_path / "access.log"
+    lines = [f'{{"url": "/api/{"x" * (i % 40)}"}}' for i in range(500)]
+    path.write_text("\n".join(lines), encoding="utf-8")
+
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        result = [line for block in _iter_mmap_blocks(mm, block_size=16) for line in block]
+
+    assert [line.decode() for line in result] == lines
+
+def test_load_lines_mmap_fallbacks(tmp_path, temp_log_file):
+    """
+    Тестирует, что для пустых и сжатых файлов mmap заменяется
+    буферизованным чтением.
+
+    Args:
+        tmp_path: Встроенная фикстура pytest с временной директорией
+        temp_log_file: Фикстура с путем к временному файлу логов
+    """
+
+    empty = tmp_path / "empty.log"
+    empty.write_bytes(b"")
+    assert not list(load_lines([str(empty)], reader="mmap"))
+
+    compressed = tmp_path / "access.log.gz"
+    with open(temp_log_file, "rb") as src, gzip.open(compressed, "wb") as dst:
+        dst.write(src.read())
+    assert list(load_lines([str(compressed)], reader="mmap")) == \
+        list(load_lines([temp_log_file], reader="bytes"))
+
+def test_load_lines_prefetch_matches_bytes(tmp_path, temp_log_file):
+    """
+    Тестирует, что чтение наперед в фоновом потоке возвращает те же строки
+    в том же порядке, в том числе для нескольких файлов и фильтра по дате.
+
+    Args:
+        tmp_path: Встроенная фикстура pytest с временной директорией
+        temp_log_file: Фикстура с путем к временному файлу логов
+    """
+
+    second = tmp_path / "second.log"
+    second.write_text('{"@timestamp": "2025-06-22T15:00:00+00:00", "url": "/next"}\n',
+                      encoding="utf-8")
+    files = [temp_log_file, str(second)]
+
+    for reader in ("bytes", "mmap"):
+        assert list(load_lines(files, reader=reader, prefetch_depth=2)) == \
+            list(load_lines(files, reader="bytes"))
+        assert list(load_lines(files, "2025-06-22", reader, prefetch_depth=1)) == \
+            list(load_lines(files, "2025-06-22", reader="bytes"))
+
+def test_load_lines_prefetch_errors(tmp_path, temp_log_file):
+    """
+    Тестирует, что ошибка открытия файла в фоновом потоке возникает
+    в основном потоке после строк предыдущих файлов, а режим text
+    не поддерживает чтение наперед.
+
+    Args:
+        tmp_path: Встроенная фикстура pytest с временной директорией
+        temp_log_file: Фикстура с путем к временному файлу логов
+    """
+
+    lines = load_lines([temp_log_file, str(tmp_path / "missing.log")],
+                       reader="bytes", prefetch_depth=2)
+    assert next(lines).startswith(b'{"@timestamp": "2025-06-22')
+    with pytest.raises(FileNotFoundError):
+        list(lines)
+
+    with pytest.raises(ValueError):
+        list(load_lines([temp_log_file], reader="text", prefetch_depth=2))
+
+def test_load_lines_clf(tmp_path, temp_log_file):
+    """
+    Тестирует, что строки файлов формата combined/common возвращаются
+    словарями во всех режимах чтения, фильтр по дате применяется к ним,
+    а JSON файлы в том же списке читаются как прежде.
+
+    Args:
+        tmp_path: Встроенная фикстура pytest с временной директорией
+        temp_log_file: Фикстура с путем к временному файлу логов
+    """
+
+    access = tmp_path / "access.log"
+    access.write_text(
+        '\n'
+        '10.0.0.1 - - [22/Jun/2025:13:57:32 +0000] "GET /api/a HTTP/1.1" 200 10 "-" "curl" 0.5\n'
+        'invalid line\n'
+        '10.0.0.2 - - [23/Jun/2025:08:00:00 +0000] "POST /api/b HTTP/1.1" 500 0 "-" "curl" 1.5\n',
+        encoding="utf-8",
+    )
+    files = [str(access), temp_log_file]
+
+    for reader in ("text", "bytes", "mmap"):
+        lines = list(load_lines(files, reader=reader))
+        assert [line["url"] for line in lines[:2]] == ["/api/a", "/api/b"]
+        assert lines[1]["response_time"] == 1.5
+        assert len(lines) == 6
+
+        filtered = list(load_lines(files, "2025-06-22", reader))
+        assert filtered[0]["@timestamp"] == "2025-06-22T13:57:32+00:00"
+        assert len(filtered) == 3
+
+
+def test_load_lines_clf_unusual_first_line(tmp_path):
+    """
+    Тестирует, что файл combined/common, первая строка которого обрезана
+    (например, при ротации), а вторая - некорректный запрос или TLS-проба,
+    не определяется как JSON.
+
+    Args:
+        tmp_path: Встроенная фикстура pytest с временной директорией
+    """
+
+    access = tmp_path / "access.log"
+    access.write_text(
+        '10.0.0.1 - - [22/Jun/2025:13:57:30 +0000] "GET /api/trunc\n'
+        '10.0.0.1 - - [22/Jun/2025:13:57:31 +0000] "\\x16\\x03\\x01" 400 157 "-" "-"\n'
+        '10.0.0.1 - - [22/Jun/2025:13:57:32 +0000] "GET /api/a HTTP/1.1" 200 10 "-" "curl" "-"\n',
+        encoding="utf-8",
+    )
+
+    for reader in ("text", "bytes", "mmap"):
+        records = list(load_lines([str(access)], reader=reader))
+        assert [(record["url"], record["status"]) for record in records] == \
+            [(None, 400), ("/api/a", 200)]
+
+def test_load_lines_date_filter_parity(tmp_path):
+    """
+    Тестирует, что все способы чтения применяют к @timestamp одно правило:
+    дата - первые 10 символов, за которыми следует "T" или конец значения.
+
+    Args:
+        tmp_path: Встроенная фикстура pytest с временной директорией
+    """
+
+    path = tmp_path / "access.log"
+    path.write_text(
+        '{"@timestamp": "2025-06-22T13:57:32+00:00", "url": "/iso"}\n'
+        '{"@timestamp": "2025-06-22 13:57:32", "url": "/space"}\n'
+        '{"@timestamp": "2025-06-22", "url": "/date"}\n'
+        '{"@timestamp": "2025-06-23T00:00:00+00:00", "url": "/other"}\n',
+        encoding="utf-8",
+    )
+
+    expected = ["/iso", "/date"]
+    for reader in ("text", "bytes", "mmap"):
+        lines = load_lines([str(path)], "2025-06-22", reader)
+        assert [_try_parse_json(line)["url"] for line in lines] == expected
+
+def test_load_lines_text_gzip(tmp_path, temp_log_file):
+    """
+    Тестирует, что режим text распаковывает файлы .gz, как и байтовые режимы.
+
+    Args:
+        tmp_path: Встроенная фикстура pytest с временной директорией
+        temp_log_file: Фикстура с путем к временному файлу логов
+    """
+
+    compressed = tmp_path / "access.log.1.gz"
+    with open(temp_log_file, "rb") as src, gzip.open(compressed, "wb") as dst:
+        dst.write(src.read())
+
+    expected = list(load_lines([temp_log_file], "2025-06-22", reader="text"))
+    assert list(load_lines([str(compressed)], "2025-06-22", reader="text")) == expected
+    assert [line.rstrip("\n").encode() for line in expected] == \
+        list(load_lines([str(compressed)], "2025-06-22", reader="bytes"))
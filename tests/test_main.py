@@ -13,8 +13,11 @@
 Используется фикстура для создания mock-данных логов.
 """
 
+import os
+import subprocess
+import sys
 import pytest
-from main import REPORTS, PRINTERS
+from main import REPORTS, PRINTERS, share_memory_limit
 
 
 @pytest.fixture
@@ -62,6 +65,9 @@ def test_average_report_integration(mock_lines):
     assert "Endpoint" in output
     assert "Запросов" in output
     assert "Ср. время (с)" in output
+    assert "Мин. (с)" in output
+    assert "Макс. (с)" in output
+    assert "Ст. откл. (с)" in output
 
     # Проверка наличия данных в выводе
     assert "/api/test" in output
@@ -133,3 +139,63 @@ def test_user_agent_report_integration(mock_lines):
 
     # Проверка корректного подсчета
     assert "1" in output  # Каждый User-Agent встречается 1 раз
+
+def test_slowest_report_integration(mock_lines):
+    """
+    Интеграционный тест для отчета по самым медленным запросам.
+
+    Проверяет, что отчет зарегистрирован в REPORTS и PRINTERS, а таблица
+    содержит заголовки и запросы в порядке убывания времени ответа.
+
+    Args:
+        mock_lines: Фикстура с тестовыми данными логов
+    """
+
+    report = REPORTS["slowest"]
+    printer = PRINTERS["slowest"]
+
+    data = report.generate(mock_lines)
+    output = printer(data)
+
+    assert "Время (с)" in output
+    assert "Endpoint" in output
+    assert "User-Agent" in output
+
+    # Более медленный запрос (0.2, curl) выводится первым
+    assert output.index("curl") < output.index("Mozilla")
+
+def test_share_memory_limit():
+    """
+    Тест деления общего лимита памяти между отчетами, сбрасывающими
+    агрегаты на диск: status_code и slowest лимит не расходуют.
+    """
+
+    types = [type(REPORTS[name]) for name in REPORTS]
+    assert share_memory_limit(300, types) == 100
+    assert share_memory_limit(300, [type(REPORTS["average"]), type(REPORTS["status_code"])]) == 300
+    assert share_memory_limit(None, types) is None
+
+def test_broken_pipe_exits_quietly(tmp_path):
+    """
+    Тест вывода в канал, закрытый получателем (например, "| head"):
+    программа завершается без traceback.
+
+    Args:
+        tmp_path: Встроенная фикстура pytest с временной директорией
+    """
+
+    path = tmp_path / "access.log"
+    path.write_text("".join(f'{{"url": "/api/{i}", "http_user_agent": "agent-{i}"}}\n'
+                            for i in range(20000)), encoding="utf-8")
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    command = [sys.executable, "main.py", "--file", str(path), "--report", "user_agent",
+               "--format", "csv"]
+
+    with subprocess.Popen(command, cwd=root, stdout=subprocess.PIPE,
+                          stderr=subprocess.PIPE) as process:
+        assert process.stdout.readline() == b"user_agent,count\n"
+        process.stdout.close()
+        stderr = process.stderr.read()
+
+    assert b"Traceback" not in stderr
+    assert process.returncode == 1
@@ -0,0 +1,65 @@
+"""
+Тесты для модуля output.
+
+Этот модуль содержит unit-тесты для отбора строк отчетов:
+- select - сортировка и отбор --top для словарей, списков и MergedItems
+"""
+
+import pytest
+from reports.average_report import AverageReport
+from reports.output import select
+from reports.slowest_report import SlowestReport
+from reports.user_agent_report import UserAgentReport
+from utils.aggregator import MergedItems
+
+
+@pytest.mark.parametrize("field, top, ascending, expected", [
+    ("count", 2, False, ["/b", "/d"]),
+    ("avg_time", 2, False, ["/c", "/b"]),
+    ("count", 2, True, ["/c", "/a"]),
+    ("url", None, True, ["/a", "/b", "/c", "/d"]),
+    ("count", None, False, ["/b", "/d", "/a", "/c"]),
+    (None, 3, False, ["/b", "/d", "/a"]),
+    ("response_time", 1, False, ["/b"]),
+    (None, None, False, ["/a", "/b", "/c", "/d"]),
+])
+def test_select_dict(average_data, field, top, ascending, expected):
+    """
+    Тестирует сортировку и отбор строк отчета-словаря.
+
+    Без поля (или с полем, которого нет в отчете) --top отбирает строки
+    по report.sort_field.
+
+    Args:
+        average_data: Фикстура с данными отчета average
+        field: Поле сортировки
+        top: Количество строк
+        ascending: Сортировка по возрастанию
+        expected: Ожидаемый порядок URL
+    """
+
+    result = select(AverageReport(), average_data, field, top, ascending)
+    assert list(result) == expected
+
+
+def test_select_scalar_values_and_merged_items():
+    """
+    Тестирует отбор из ленивого MergedItems со скалярными значениями.
+    """
+
+    data = MergedItems(iter([("curl", 3), ("Mozilla", 10), ("bot", 1)]))
+    assert select(UserAgentReport(), data, top=2) == {"Mozilla": 10, "curl": 3}
+
+
+def test_select_list_and_passthrough():
+    """
+    Тестирует отбор строк отчета-списка и возврат данных без изменений.
+    """
+
+    data = [{"response_time": 0.5, "url": "/a"}, {"response_time": 0.9, "url": "/b"}]
+    report = SlowestReport()
+
+    assert select(report, data) is data
+    assert select(report, data, "response_time") == data[::-1]
+    assert select(report, data, "response_time", ascending=True) == data
+    assert select(report, data, top=1) == [data[1]]
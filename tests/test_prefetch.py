@@ -0,0 +1,84 @@
+"""
+Тесты для модуля prefetch.
+
+Этот модуль содержит unit-тесты для чтения наперед в фоновом потоке:
+- порядок элементов и режим без фонового потока
+- ограничение очереди (backpressure)
+- передача ошибок чтения в основной поток
+- остановка фонового потока и закрытие источника при досрочном выходе
+"""
+
+import threading
+import pytest
+from utils.prefetch import prefetch
+
+
+def test_prefetch_preserves_order():
+    """
+    Тестирует, что элементы возвращаются в исходном порядке при любой глубине.
+    """
+
+    for depth in (0, 1, 4):
+        assert list(prefetch(iter(range(100)), depth)) == list(range(100))
+
+
+def test_prefetch_backpressure():
+    """
+    Тестирует, что фоновый поток читает не больше depth элементов наперед.
+    """
+
+    produced = []
+    blocked = threading.Event()
+
+    def source():
+        for i in range(100):
+            produced.append(i)
+            if len(produced) > 3:
+                blocked.set()
+            yield i
+
+    items = prefetch(source(), depth=2)
+    assert next(items) == 0
+    # Очередь из 2 элементов + 1 элемент, ожидающий места в очереди
+    blocked.wait(timeout=1)
+    assert len(produced) <= 4
+    items.close()
+
+
+def test_prefetch_forwards_read_errors():
+    """
+    Тестирует, что ошибка чтения возникает после уже прочитанных элементов.
+    """
+
+    def source():
+        yield 1
+        yield 2
+        raise OSError("ошибка чтения")
+
+    items = prefetch(source(), depth=4)
+    assert next(items) == 1
+    assert next(items) == 2
+    with pytest.raises(OSError, match="ошибка чтения"):
+        next(items)
+
+
+def test_prefetch_close_stops_producer():
+    """
+    Тестирует, что при досрочном выходе источник закрывается, а фоновый
+    поток завершается.
+    """
+
+    closed = threading.Event()
+
+    def source():
+        try:
+            yield from range(1_000_000)
+        finally:
+            closed.set()
+
+    items = prefetch(source(), depth=2)
+    assert next(items) == 0
+    items.close()
+
+    assert closed.is_set()
+    assert not any(thread.name == "log-prefetch" for thread in threading.enumerate())
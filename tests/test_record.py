@@ -0,0 +1,120 @@
+"""
+Тесты для модуля record.
+
+Этот модуль содержит unit-тесты для компактного представления записей:
+- parse_record / LogRecord.from_dict - нормализация типов полей
+- RecordBatch - колоночное хранение и обратное преобразование в записи
+- iter_batches - разбор строк в пакеты заданного размера
+"""
+
+import math
+import pytest
+from utils.record import (MISSING_STATUS, LogRecord, RecordBatch, iter_batches,
+                          parse_record)
+
+
+def test_parse_record_normalizes_types():
+    """
+    Тестирует приведение status к int и response_time к float при разборе.
+    """
+
+    record = parse_record(
+        '{"@timestamp": "2025-06-22T13:57:32+00:00", "status": "200", "url": "/api", '
+        '"request_method": "GET", "response_time": "0.1", "http_user_agent": "curl"}'
+    )
+
+    assert record == LogRecord(
+        timestamp="2025-06-22T13:57:32+00:00",
+        status=200,
+        url="/api",
+        method="GET",
+        response_time=0.1,
+        user_agent="curl",
+    )
+
+
+@pytest.mark.parametrize("line, field, expected", [
+    ('{"url": "/api", "response_time": "not_a_number"}', "response_time", None),
+    ('{"url": "/api", "response_time": "nan"}', "response_time", None),
+    ('{"url": "/api", "status": "2xx"}', "status", None),
+    ('{"url": "/api", "status": 99999999999}', "status", None),
+    ('{"url": 42}', "url", None),
+    ('{"url": ""}', "url", None),
+])
+def test_parse_record_invalid_fields(line, field, expected):
+    """
+    Тестирует, что некорректные значения полей заменяются на None.
+
+    Args:
+        line: Строка лога
+        field: Проверяемое поле LogRecord
+        expected: Ожидаемое значение поля
+    """
+
+    assert getattr(parse_record(line), field) == expected
+
+
+@pytest.mark.parametrize("line", ["invalid json", "[1, 2]", "{}", ""])
+def test_parse_record_not_object(line):
+    """
+    Тестирует, что строки, не являющиеся непустым JSON объектом, пропускаются.
+
+    Args:
+        line: Строка лога
+    """
+
+    assert parse_record(line) is None
+
+
+def test_log_record_has_slots():
+    """
+    Тестирует, что LogRecord не создает __dict__ для каждого экземпляра.
+    """
+
+    assert not hasattr(LogRecord(), "__dict__")
+
+
+def test_record_batch_columns_roundtrip():
+    """
+    Тестирует колоночное хранение пакета и обратное преобразование в записи.
+    """
+
+    records = [
+        LogRecord(timestamp="t1", status=200, url="/a", method="GET",
+                  response_time=0.5, user_agent="curl"),
+        LogRecord(url="/b"),
+    ]
+    batch = RecordBatch()
+    for record in records:
+        batch.append_record(record)
+
+    assert len(batch) == 2
+    assert list(batch.statuses) == [200, MISSING_STATUS]
+    assert batch.response_times[0] == 0.5
+    assert math.isnan(batch.response_times[1])
+    assert list(batch) == records
+
+
+def test_record_batch_append_matches_from_dict():
+    """
+    Тестирует, что append из словаря нормализует поля так же, как from_dict.
+    """
+
+    obj = {"status": "404", "url": "/api", "response_time": 1, "http_user_agent": None}
+    batch = RecordBatch()
+    batch.append(obj)
+
+    assert list(batch) == [LogRecord.from_dict(obj)]
+
+
+def test_iter_batches_sizes():
+    """
+    Тестирует группировку строк в пакеты и пропуск некорректных строк.
+    """
+
+    lines = [f'{{"url": "/api/{i}"}}' for i in range(10)] + ["invalid json"]
+    batches = list(iter_batches(lines, size=4))
+
+    assert [len(batch) for batch in batches] == [4, 4, 2]
+    assert [record.url for batch in batches for record in batch] == \
+        [f"/api/{i}" for i in range(10)]
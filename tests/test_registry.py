@@ -0,0 +1,137 @@
+"""
+Тесты для модуля registry.
+
+Этот модуль содержит unit-тесты для реестра отчетов:
+- load_object - импорт объекта по строке "модуль:атрибут"
+- ReportRegistry - отложенный импорт отчетов и поиск через entry points
+- PrinterRegistry - функции форматирования из атрибута printer отчета
+- main - импорт модуля без загрузки отчетов и tabulate
+"""
+
+import os
+import subprocess
+import sys
+from importlib import metadata
+import pytest
+from reports.printers import print_rows, print_status
+from reports.registry import ReportRegistry, load_object
+from reports.status_report import StatusReport
+
+
+@pytest.fixture
+def plugin_module(tmp_path, monkeypatch):
+    """
+    Фикстура с модулем стороннего отчета, который еще не импортирован.
+
+    Returns:
+        str: Имя модуля с классом PluginReport без атрибута printer
+    """
+
+    (tmp_path / "plugin_reports.py").write_text(
+        "from reports.status_report import StatusReport\n"
+        "class PluginReport(StatusReport):\n"
+        "    printer = None\n",
+        encoding="utf-8",
+    )
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.delitem(sys.modules, "plugin_reports", raising=False)
+    return "plugin_reports"
+
+
+def test_load_object():
+    """
+    Тестирует импорт объекта и ошибки для некорректных путей.
+    """
+
+    assert load_object("reports.printers:print_status") is print_status
+    with pytest.raises(ValueError):
+        load_object("reports.printers")
+    with pytest.raises(ImportError):
+        load_object("reports.printers:missing")
+
+
+def test_registry_imports_report_on_access(plugin_module):
+    """
+    Тестирует, что модуль отчета импортируется только при обращении к нему.
+
+    Args:
+        plugin_module: Фикстура с модулем стороннего отчета
+    """
+
+    registry = ReportRegistry({"plugin": f"{plugin_module}:PluginReport"}, group=None)
+
+    assert "plugin" in registry
+    assert list(registry) == ["plugin"]
+    assert plugin_module not in sys.modules
+
+    report = registry["plugin"]
+    assert plugin_module in sys.modules
+    assert registry["plugin"] is report
+    # Отчет без printer выводится таблицей по умолчанию
+    assert registry.printers["plugin"] is print_rows
+
+
+def test_registry_discovers_entry_points(plugin_module, monkeypatch):
+    """
+    Тестирует поиск отчетов через entry points только для неизвестных имен.
+
+    Args:
+        plugin_module: Фикстура с модулем стороннего отчета
+        monkeypatch: Встроенная фикстура pytest для подмены функций
+    """
+
+    calls = []
+
+    def fake_entry_points(group):
+        calls.append(group)
+        return [metadata.EntryPoint("plugin", f"{plugin_module}:PluginReport", group)]
+
+    monkeypatch.setattr(metadata, "entry_points", fake_entry_points)
+    registry = ReportRegistry()
+
+    assert "status_code" in registry
+    assert not calls
+
+    assert "plugin" in registry
+    assert "missing" not in registry
+    assert calls == ["workmate.reports"]
+    assert list(registry) == ["average", "status_code", "user_agent", "slowest", "slo", "plugin"]
+    with pytest.raises(KeyError):
+        _ = registry["missing"]
+
+
+def test_builtin_printers():
+    """
+    Тестирует, что встроенные отчеты объявляют свои функции форматирования.
+    """
+
+    registry = ReportRegistry(group=None)
+
+    assert isinstance(registry["status_code"], StatusReport)
+    assert registry.printers["status_code"] is print_status
+    assert set(registry.printers) == {"average", "status_code", "user_agent", "slowest", "slo"}
+
+
+def test_print_rows():
+    """
+    Тестирует таблицу по умолчанию для словаря и списка словарей.
+    """
+
+    assert "/api" in print_rows({"/api": 3})
+    assert "url" in print_rows([{"url": "/api", "count": 3}])
+
+
+def test_main_import_is_lazy():
+    """
+    Тестирует, что импорт main не загружает модули отчетов и tabulate.
+    """
+
+    code = (
+        "import sys, main\n"
+        "loaded = [m for m in sys.modules if m == 'tabulate' or m.endswith('_report')]\n"
+        "print(loaded)\n"
+    )
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    result = subprocess.run([sys.executable, "-c", code], cwd=root, capture_output=True,
+                            text=True, check=True)
+    assert result.stdout.strip() == "[]"
@@ -5,16 +5,25 @@ Unit-тесты для модулей отчетов и парсера.
 - AverageReport - отчет по среднему времени ответа
 - StatusReport - отчет по статус-кодам
 - UserAgentReport - отчет по User-Agent'ам
+- SlowestReport - отчет по самым медленным запросам
+- SloReport - отчет по окнам, нарушившим SLO
 - _try_parse_json - функция парсинга JSON строк
+- accumulate_reports - однопроходная агрегация нескольких отчетов
+- parse_clf - записи логов combined/common в тех же отчетах
 
 Тесты проверяют изолированную функциональность каждого компонента.
 """
 
 import pytest
 from reports.average_report import AverageReport
+from reports.base import accumulate_reports
+from reports.slo_report import SloReport, SloTargets
+from reports.slowest_report import SlowestReport
 from reports.status_report import StatusReport
 from reports.user_agent_report import UserAgentReport
+from utils.clf_parser import parse_clf
 from utils.log_parser import _try_parse_json
+from utils.record import parse_record
 
 
 @pytest.fixture
@@ -50,6 +59,7 @@ def test_average_report(sample_lines):
     - Группирует запросы по URL
     - Подсчитывает количество запросов для каждого URL
     - Вычисляет среднее время ответа
+    - Вычисляет минимум, максимум, дисперсию и стандартное отклонение
     - Игнорирует строки без данных для этого отчета
 
     Args:
@@ -61,15 +71,18 @@ def test_average_report(sample_lines):
 
     # Ожидаемые результаты
     expected = {
-        "/api/test": {"count": 2, "avg_time": 0.15},
-        "/api/other": {"count": 1, "avg_time": 0.3},
+        "/api/test": {"count": 2, "avg_time": 0.15, "min_time": 0.1, "max_time": 0.2,
+                      "variance": 0.0025, "stddev": 0.05},
+        "/api/other": {"count": 1, "avg_time": 0.3, "min_time": 0.3, "max_time": 0.3,
+                       "variance": 0.0, "stddev": 0.0},
     }
 
     # Проверка всех ожидаемых результатов
     for url, data in expected.items():
         assert url in result
         assert result[url]["count"] == data["count"]
-        assert result[url]["avg_time"] == pytest.approx(data["avg_time"])
+        for key in ("avg_time", "min_time", "max_time", "variance", "stddev"):
+            assert result[url][key] == pytest.approx(data[key])
 
 def test_status_report(sample_lines):
     """
@@ -155,3 +168,251 @@ def test_average_parsing(input_line, should_succeed, expected_url, expected_time
         # Проверка неуспешного парсинга
         if expected_url is not None and obj:
             assert obj.get("url") == expected_url
+
+def test_accumulate_reports_single_pass(sample_lines):
+    """
+    Тест однопроходной агрегации нескольких отчетов.
+
+    Проверяет, что accumulate_reports с последующей финализацией дает
+    тот же результат, что и отдельный generate() каждого отчета.
+
+    Args:
+        sample_lines: Фикстура с тестовыми данными
+    """
+
+    reports = {
+        "status_code": StatusReport(),
+        "user_agent": UserAgentReport(),
+    }
+    states = accumulate_reports(reports, iter(sample_lines))
+
+    for name, report in reports.items():
+        assert report.finalize(states[name]) == report.generate(sample_lines)
+
+def test_slowest_report():
+    """
+    Unit-тест для SlowestReport.
+
+    Проверяет что отчет корректно:
+    - Оставляет только K самых медленных запросов
+    - Сортирует их по убыванию времени ответа
+    - Сохраняет timestamp, статус и User-Agent запроса
+    - Игнорирует записи без URL или с некорректным временем
+    """
+
+    lines = [
+        f'{{"@timestamp": "2025-06-22T13:57:{i:02d}+00:00", "url": "/api/{i}", '
+        f'"response_time": {i / 100}, "status": 200, "http_user_agent": "curl"}}'
+        for i in range(50)
+    ]
+    lines += [
+        '{"url": "/api/bad", "response_time": "not_a_number"}',
+        '{"response_time": 10.0}',
+    ]
+
+    result = SlowestReport(limit=3).generate(lines)
+
+    assert [row["url"] for row in result] == ["/api/49", "/api/48", "/api/47"]
+    assert result[0]["response_time"] == pytest.approx(0.49)
+    assert result[0]["timestamp"] == "2025-06-22T13:57:49+00:00"
+    assert result[0]["status"] == "200"
+    assert result[0]["user_agent"] == "curl"
+
+def test_slowest_report_merge():
+    """
+    Тест объединения частичных состояний SlowestReport.
+
+    Проверяет, что объединение куч разных частей дает тот же топ,
+    что и обработка всех строк сразу, в том числе через dump/load.
+    """
+
+    lines = [f'{{"url": "/api/{i}", "response_time": {(i * 37 % 101) / 10}}}' for i in range(200)]
+    report = SlowestReport(limit=5)
+
+    first = report.new_state()
+    second = report.new_state()
+    for i, line in enumerate(lines):
+        report.update(first if i % 2 else second, parse_record(line))
+
+    merged = report.merge(first, report.load_state(report.dump_state(second)))
+    assert report.finalize(merged) == report.generate(lines)
+
+
+def _slo_line(minute, url, status=200, response_time=0.1):
+    """Создает строку лога для отчета SLO с временем 2025-06-22T10:<minute>:00."""
+    return (f'{{"@timestamp": "2025-06-22T10:{minute:02d}:00+00:00", "url": "{url}", '
+            f'"status": {status}, "response_time": {response_time}}}')
+
+
+def test_slo_report_breaches():
+    """
+    Тест отчета SloReport по окнам с превышением бюджета.
+
+    Проверяет, что:
+    - Окно с долей 5xx выше цели попадает в отчет с burn rate
+    - Окно с долей медленных запросов выше цели попадает в отчет
+    - Окна в пределах цели и записи без @timestamp не учитываются
+    """
+
+    targets = SloTargets(window=60, windows=10, error_rate=0.1, latency=1.0, slow_rate=0.5)
+    lines = [_slo_line(0, "/api/a") for _ in range(8)]
+    lines += [_slo_line(0, "/api/a", status=500) for _ in range(2)]
+    lines += [_slo_line(1, "/api/a") for _ in range(10)]
+    lines += [_slo_line(2, "/api/b", response_time=2.0), _slo_line(2, "/api/b")]
+    lines += [_slo_line(2, "/api/b", response_time=3.0)]
+    lines += ['{"url": "/api/a", "status": 500}']
+
+    result = SloReport(targets).generate(lines)
+
+    assert [(row["url"], row["window_start"]) for row in result] == [
+        ("/api/a", "2025-06-22T10:00:00+00:00"),
+        ("/api/b", "2025-06-22T10:02:00+00:00"),
+    ]
+    assert result[0]["requests"] == 10
+    assert result[0]["errors"] == 2
+    assert result[0]["error_burn"] == pytest.approx(2.0)
+    assert result[1]["slow"] == 2
+    assert result[1]["latency_burn"] == pytest.approx(4 / 3)
+    assert result[1]["burn_rate"] == result[1]["latency_burn"]
+
+
+def test_slo_report_ring_buffer():
+    """
+    Тест кольцевого буфера окон SloReport.
+
+    Проверяет, что окна с нарушением, вытесненные более новыми окнами,
+    остаются в отчете, а записи старше окна в их ячейке отбрасываются.
+    """
+
+    targets = SloTargets(window=60, windows=2, error_rate=0.1)
+    lines = [_slo_line(minute, "/api/a", status=500) for minute in (0, 1, 2, 3, 0)]
+
+    result = SloReport(targets).generate(lines)
+
+    assert [row["window_start"] for row in result] == [
+        f"2025-06-22T10:0{minute}:00+00:00" for minute in range(4)
+    ]
+    assert all(row["requests"] == 1 for row in result)
+
+
+def test_slo_report_evicted_breach():
+    """
+    Тест окна с нарушением задолго до последней записи.
+
+    Проверяет, что сбой в первом окне попадает в отчет, хотя после него
+    идет больше windows окон без нарушений, в том числе при обработке
+    по одной записи и при объединении частей, а max_breaches ограничивает
+    число сохраненных окон с наибольшим burn rate.
+    """
+
+    lines = [_slo_line(0, "/api/a", status=500) for _ in range(3)]
+    lines += [_slo_line(0, "/api/a")]
+    lines += [_slo_line(minute, "/api/a") for minute in range(1, 11)]
+    lines.insert(9, _slo_line(5, "/api/a", status=500))
+    report = SloReport(SloTargets(window=60, windows=2, error_rate=0.1))
+
+    result = report.generate(lines)
+    assert [(row["window_start"], row["requests"], row["errors"]) for row in result] == [
+        ("2025-06-22T10:00:00+00:00", 4, 3),
+        ("2025-06-22T10:05:00+00:00", 2, 1),
+    ]
+
+    state = report.new_state()
+    for line in lines:
+        report.update(state, parse_record(line))
+    assert report.finalize(state) == result
+
+    first, second = report.new_state(), report.new_state()
+    for line in lines[:8]:
+        report.update(first, parse_record(line))
+    for line in lines[8:]:
+        report.update(second, parse_record(line))
+    merged = report.merge(report.load_state(report.dump_state(second)), first)
+    assert report.finalize(merged) == result
+
+    capped = SloReport(SloTargets(window=60, windows=2, error_rate=0.1, max_breaches=1))
+    assert capped.generate(lines) == result[:1]
+
+
+def test_slo_report_merge():
+    """
+    Тест объединения частичных состояний SloReport.
+
+    Проверяет, что объединение состояний разных частей, в том числе
+    через dump/load и после сброса на диск, дает тот же результат,
+    что и обработка всех строк сразу.
+    """
+
+    lines = [_slo_line(i * 7 // 500, f"/api/{i % 3}", status=500 if i % 5 == 0 else 200,
+                       response_time=(i % 11) / 5) for i in range(500)]
+    report = SloReport(SloTargets(window=60, windows=5))
+    spilling = SloReport(SloTargets(window=60, windows=5), memory_limit=1024)
+
+    first = spilling.new_state()
+    second = report.new_state()
+    for i, line in enumerate(lines):
+        (spilling if i % 2 else report).update(first if i % 2 else second, parse_record(line))
+
+    merged = report.merge(report.load_state(spilling.dump_state(first)), second)
+    assert report.finalize(merged) == report.generate(lines)
+    assert report.generate(lines)
+
+
+@pytest.mark.parametrize("targets", [
+    SloTargets(window=300, windows=5),
+    SloTargets(window=60, windows=12),
+    SloTargets(window=60, windows=5, latency=0.5),
+    SloTargets(window=60, windows=5, error_rate=0.5),
+    SloTargets(window=60, windows=5, max_breaches=1),
+])
+def test_slo_report_load_state_mismatch(targets):
+    """
+    Тест отклонения состояния SloReport, созданного с другими параметрами:
+    номера окон, счетчики медленных запросов и сохраненные окна
+    с нарушением в нем несовместимы с параметрами отчета.
+
+    Args:
+        targets: Параметры отчета, загружающего состояние
+    """
+
+    source = SloReport(SloTargets(window=60, windows=5))
+    state = source.new_state()
+    source.update(state, parse_record(_slo_line(0, "/api/a")))
+    data = source.dump_state(state)
+
+    with pytest.raises(ValueError):
+        SloReport(targets).load_state(data)
+    assert SloReport(SloTargets(window=60, windows=5)).load_state(data)
+
+
+def test_reports_clf_records():
+    """
+    Тестирует, что записи логов combined/common дают те же отчеты,
+    что и эквивалентные JSON строки.
+    """
+
+    clf_lines = [
+        '10.0.0.1 - - [22/Jun/2025:13:57:32 +0000] "GET /api/a HTTP/1.1" 200 10 "-" "curl" 0.5',
+        '10.0.0.1 - - [22/Jun/2025:13:57:33 +0000] "GET /api/a HTTP/1.1" 500 10 "-" "wget" 1.5',
+        '10.0.0.1 - - [22/Jun/2025:13:57:34 +0000] "GET /api/b HTTP/1.1" 404 10',
+    ]
+    json_lines = [
+        '{"@timestamp": "2025-06-22T13:57:32+00:00", "status": 200, "url": "/api/a", '
+        '"request_method": "GET", "response_time": 0.5, "http_user_agent": "curl"}',
+        '{"@timestamp": "2025-06-22T13:57:33+00:00", "status": 500, "url": "/api/a", '
+        '"request_method": "GET", "response_time": 1.5, "http_user_agent": "wget"}',
+        '{"@timestamp": "2025-06-22T13:57:34+00:00", "status": 404, "url": "/api/b", '
+        '"request_method": "GET", "response_time": null, "http_user_agent": null}',
+    ]
+    reports = {
+        "average": AverageReport(),
+        "status_code": StatusReport(),
+        "user_agent": UserAgentReport(),
+        "slowest": SlowestReport(),
+    }
+
+    clf_states = accumulate_reports(reports, map(parse_clf, clf_lines))
+    json_states = accumulate_reports(reports, iter(json_lines))
+    for name, report in reports.items():
+        assert report.finalize(clf_states[name]) == report.finalize(json_states[name])
+    assert reports["status_code"].finalize(clf_states["status_code"]) == {"200": 1, "500": 1, "404": 1}
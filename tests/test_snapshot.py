@@ -0,0 +1,129 @@
+"""
+Тесты для модуля snapshot и распределенного слияния частичных агрегатов.
+
+Этот модуль содержит тесты для:
+- encode_snapshot / decode_snapshot - формат снимка и его проверки
+- write_snapshot / read_snapshot - запись и чтение файлов снимков
+- merge_partials - объединение снимков в итоговые данные отчетов
+"""
+
+import struct
+import zlib
+import pytest
+from main import REPORTS, merge_partials
+from reports.base import accumulate_reports
+from utils.snapshot import (FORMAT_VERSION, MAGIC, decode_snapshot, encode_snapshot,
+                            read_snapshot, write_snapshot)
+
+
+@pytest.fixture
+def node_lines():
+    """
+    Фикстура с логами двух узлов.
+
+    Returns:
+        tuple[list, list]: Строки логов первого и второго узла
+    """
+
+    first = [
+        '{"url": "/api/a", "response_time": 0.1, "status": 200, "http_user_agent": "curl"}',
+        '{"url": "/api/b", "response_time": 0.4, "status": 500, "http_user_agent": "Mozilla"}',
+    ]
+    second = [
+        '{"url": "/api/a", "response_time": 0.3, "status": 200, "http_user_agent": "curl"}',
+        '{"url": "/api/c", "response_time": 0.2, "status": 404, "http_user_agent": "curl"}',
+    ]
+    return first, second
+
+
+def _emit(lines, path):
+    """Создает снимок всех отчетов по строкам лога, как --emit-partial."""
+    states = accumulate_reports(REPORTS, lines)
+    write_snapshot(path, {name: report.dump_state(states[name])
+                          for name, report in REPORTS.items()})
+
+
+def test_snapshot_roundtrip():
+    """
+    Тестирует кодирование и декодирование снимка.
+    """
+
+    states = {"status_code": [["200", 3]], "user_agent": [["Mozilla/5.0", 1]]}
+    data = encode_snapshot(states)
+
+    assert data.startswith(MAGIC)
+    assert decode_snapshot(data) == states
+
+
+@pytest.mark.parametrize("data", [
+    b"",
+    b"NOPE" + struct.pack(">H", FORMAT_VERSION) + zlib.compress(b"{}"),
+    MAGIC + struct.pack(">H", FORMAT_VERSION + 1) + zlib.compress(b"{}"),
+    MAGIC + struct.pack(">H", FORMAT_VERSION) + b"not zlib",
+    MAGIC + struct.pack(">H", FORMAT_VERSION) + zlib.compress(b"[]"),
+    MAGIC + struct.pack(">H", FORMAT_VERSION) + zlib.compress(b'{"reports": 1}'),
+])
+def test_decode_snapshot_invalid(data):
+    """
+    Тестирует, что некорректные снимки приводят к ValueError.
+
+    Args:
+        data: Байты некорректного снимка
+    """
+
+    with pytest.raises(ValueError):
+        decode_snapshot(data)
+
+
+def test_merge_partials_matches_single_run(tmp_path, node_lines):
+    """
+    Тестирует, что объединение снимков двух узлов дает тот же результат,
+    что и обработка всех логов на одном узле.
+
+    Args:
+        tmp_path: Встроенная фикстура pytest с временной директорией
+        node_lines: Фикстура с логами двух узлов
+    """
+
+    first, second = node_lines
+    paths = [str(tmp_path / "edge1.bin"), str(tmp_path / "edge2.bin")]
+    _emit(first, paths[0])
+    _emit(second, paths[1])
+
+    assert set(read_snapshot(paths[0])) == set(REPORTS)
+
+    states = merge_partials(REPORTS, paths)
+    for name, report in REPORTS.items():
+        merged = report.finalize(states[name])
+        expected = report.generate(first + second)
+        if name == "average":
+            for url, data in expected.items():
+                assert merged[url]["count"] == data["count"]
+                assert merged[url]["avg_time"] == pytest.approx(data["avg_time"])
+                assert merged[url]["stddev"] == pytest.approx(data["stddev"])
+        else:
+            assert merged == expected
+
+
+def test_merge_partials_invalid(tmp_path):
+    """
+    Тестирует, что отсутствующий файл, файл другого формата и снимок
+    с поврежденным состоянием отчета приводят к OSError или ValueError
+    с путем к файлу, а не к KeyError или TypeError.
+
+    Args:
+        tmp_path: Встроенная фикстура pytest с временной директорией
+    """
+
+    with pytest.raises(OSError):
+        merge_partials(REPORTS, [str(tmp_path / "missing.bin")])
+
+    other = tmp_path / "other.bin"
+    other.write_bytes(b"not a snapshot")
+    with pytest.raises(ValueError, match="other.bin"):
+        merge_partials(REPORTS, [str(other)])
+
+    broken = str(tmp_path / "broken.bin")
+    write_snapshot(broken, {"average": {"unexpected": 1}, "slo": 7})
+    with pytest.raises(ValueError, match="broken.bin"):
+        merge_partials(REPORTS, [broken])
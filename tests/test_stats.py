@@ -0,0 +1,91 @@
+"""
+Тесты для модуля stats.
+
+Этот модуль содержит unit-тесты для LatencyStats:
+- однопроходное вычисление среднего, минимума, максимума и дисперсии
+- объединение частичных статистик по формулам Чана
+- точность компенсированного суммирования
+- сериализация состояния для сброса на диск
+"""
+
+import math
+import statistics
+import pytest
+from utils.stats import LatencyStats
+
+
+def _collect(values):
+    """Строит LatencyStats по списку значений."""
+    stats = LatencyStats()
+    for value in values:
+        stats.add(value)
+    return stats
+
+
+def test_latency_stats_single_pass():
+    """
+    Тестирует вычисление всех показателей за один проход.
+    """
+
+    values = [0.1, 0.25, 0.05, 0.4, 0.2]
+    stats = _collect(values)
+
+    assert stats.count == 5
+    assert stats.average == pytest.approx(statistics.fmean(values))
+    assert stats.min == 0.05
+    assert stats.max == 0.4
+    assert stats.variance == pytest.approx(statistics.pvariance(values))
+    assert stats.stddev == pytest.approx(statistics.pstdev(values))
+
+
+def test_latency_stats_merge_matches_single_pass():
+    """
+    Тестирует, что объединение частей равно статистике по всем данным.
+    """
+
+    values = [(i % 13) / 100 + 0.001 * i for i in range(1000)]
+    parts = [_collect(values[i:i + 137]) for i in range(0, len(values), 137)]
+
+    merged = parts[0]
+    for part in parts[1:]:
+        merged = LatencyStats.merge(merged, part)
+    expected = _collect(values)
+
+    assert merged.count == expected.count
+    assert merged.average == pytest.approx(expected.average)
+    assert merged.variance == pytest.approx(expected.variance)
+    assert merged.min == expected.min
+    assert merged.max == expected.max
+
+
+def test_latency_stats_merge_with_empty():
+    """
+    Тестирует объединение с пустой статистикой.
+    """
+
+    stats = _collect([0.3, 0.5])
+
+    assert LatencyStats.merge(LatencyStats(), stats) is stats
+    assert LatencyStats.merge(stats, LatencyStats()).count == 2
+
+
+def test_latency_stats_compensated_sum():
+    """
+    Тестирует, что компенсированная сумма не теряет малые слагаемые.
+    """
+
+    values = [1e8] + [1e-3] * 100000
+    stats = _collect(values)
+
+    assert stats.sum == math.fsum(values)
+
+
+def test_latency_stats_roundtrip():
+    """
+    Тестирует сериализацию состояния в список и обратно.
+    """
+
+    stats = _collect([0.1, 0.2, 0.3])
+    restored = LatencyStats.from_list(stats.to_list())
+
+    assert restored.to_list() == stats.to_list()
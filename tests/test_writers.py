@@ -0,0 +1,90 @@
+"""
+Тесты для модуля writers.
+
+Этот модуль содержит unit-тесты для вывода отчетов:
+- iter_rows - строки данных отчета в виде словарей
+- write_json, write_csv, write_openmetrics - потоковые форматы вывода
+"""
+
+import csv
+import io
+import json
+from reports.average_report import AverageReport
+from reports.slowest_report import SlowestReport
+from reports.status_report import StatusReport
+from reports.writers import iter_rows, write_csv, write_json, write_openmetrics
+
+
+def test_iter_rows():
+    """
+    Тестирует преобразование данных отчетов в строки с полями report.fields.
+    """
+
+    assert list(iter_rows(StatusReport(), {"200": 3})) == [{"status": "200", "count": 3}]
+    rows = list(iter_rows(AverageReport(), {"/a": {"count": 1, "avg_time": 0.1}}))
+    assert rows == [{"url": "/a", "count": 1, "avg_time": 0.1}]
+
+
+def test_write_json_lines():
+    """
+    Тестирует вывод JSON Lines: одна строка - один объект с ключом report.
+    """
+
+    out = io.StringIO()
+    write_json(out, [("status_code", StatusReport(), {"200": 3, "404": 1})])
+
+    rows = [json.loads(line) for line in out.getvalue().splitlines()]
+    assert rows == [
+        {"report": "status_code", "status": "200", "count": 3},
+        {"report": "status_code", "status": "404", "count": 1},
+    ]
+
+
+def test_write_csv_blocks(average_data):
+    """
+    Тестирует вывод CSV с заголовком для каждого отчета.
+
+    Args:
+        average_data: Фикстура с данными отчета average
+    """
+
+    out = io.StringIO()
+    write_csv(out, [
+        ("average", AverageReport(), {"/a": average_data["/a"]}),
+        ("status_code", StatusReport(), {"200": 3}),
+    ])
+
+    first, second = out.getvalue().split("\n\n")
+    rows = list(csv.DictReader(io.StringIO(first)))
+    assert rows[0]["url"] == "/a"
+    assert rows[0]["count"] == "5"
+    assert second.splitlines() == ["status,count", "200,3"]
+
+
+def test_write_openmetrics(average_data):
+    """
+    Тестирует, что семейства метрик не перемежаются, метки экранируются,
+    а вывод завершается строкой # EOF.
+
+    Args:
+        average_data: Фикстура с данными отчета average
+    """
+
+    out = io.StringIO()
+    write_openmetrics(out, [
+        ("average", AverageReport(), {"/a": average_data["/a"], '/q"x': average_data["/b"]}),
+        ("slowest", SlowestReport(), [{"response_time": 0.5, "timestamp": "t", "url": "/a",
+                                       "status": "200", "user_agent": "curl"}]),
+    ])
+    lines = out.getvalue().splitlines()
+
+    assert lines[-1] == "# EOF"
+    families = [line.split()[2] for line in lines if line.startswith("# TYPE")]
+    assert families[:2] == ["workmate_average_count", "workmate_average_avg_time"]
+    assert families[-1] == "workmate_slowest_response_time"
+    # Метрики каждого семейства идут подряд сразу после его описания
+    samples = [line.split("{")[0] for line in lines if not line.startswith("#")]
+    assert samples == sorted(samples, key=families.index)
+    assert 'workmate_average_count{url="/q\\"x"} 50' in lines
+    assert ('workmate_slowest_response_time{timestamp="t",url="/a",status="200",'
+            'user_agent="curl",rank="1"} 0.5') in lines
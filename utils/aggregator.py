@@ -0,0 +1,350 @@
+"""
+Модуль внешней (spill-to-disk) агрегации для отчетов анализатора логов.
+
+Этот модуль предоставляет агрегатор "ключ -> состояние", который держит
+данные в памяти, пока их оценочный объем не превысит заданный лимит.
+При превышении лимита текущие данные сортируются по ключу и сбрасываются
+во временный файл (partial run), а в конце все файлы объединяются
+k-way слиянием. Результат остается точным при любой кардинальности ключей.
+Чтобы ограничить число открытых файлов, части сливаются по уровням:
+_MERGE_FACTOR частей одного уровня объединяются в одну часть следующего
+уровня, поэтому каждая запись переписывается на диск логарифмическое
+число раз.
+
+Классы:
+    SpillingAggregator: Агрегатор с ограничением памяти
+    MergedItems: Ленивый результат слияния сброшенных на диск частей
+
+Функции:
+    parse_memory_limit(value): Разбор лимита памяти вида "512M", "2G"
+
+Использование:
+    from utils.aggregator import SpillingAggregator, parse_memory_limit
+
+    agg = SpillingAggregator(int, operator.add, memory_limit=parse_memory_limit("64M"))
+    agg.add("Mozilla/5.0", 1)
+    for key, count in agg.items():
+        ...
+"""
+
+import heapq
+import json
+import sys
+import tempfile
+
+# Примерные накладные расходы на одну запись словаря (слот хеш-таблицы,
+# ссылки на ключ и значение), байт
+_ENTRY_OVERHEAD = 100
+
+# Количество частей одного уровня, которые сливаются в одну часть следующего
+# уровня. Каждая запись переписывается на диск O(log N) раз, а не при каждом
+# слиянии, и открытых файлов не больше (_MERGE_FACTOR - 1) на уровень
+_MERGE_FACTOR = 16
+
+_SIZE_SUFFIXES = {
+    "K": 1024,
+    "M": 1024 ** 2,
+    "G": 1024 ** 3,
+}
+
+
+def parse_memory_limit(value):
+    """
+    Разбирает лимит памяти из строки командной строки.
+
+    Args:
+        value (str): Размер в байтах или с суффиксом K, M, G (например "512M")
+
+    Returns:
+        int: Лимит памяти в байтах
+
+    Raises:
+        ValueError: Если строка не является корректным положительным размером
+    """
+
+    text = str(value).strip().upper().removesuffix("B")
+    multiplier = 1
+    if text and text[-1] in _SIZE_SUFFIXES:
+        multiplier = _SIZE_SUFFIXES[text[-1]]
+        text = text[:-1]
+
+    try:
+        limit = int(float(text) * multiplier)
+    except ValueError:
+        raise ValueError(f"Некорректный лимит памяти: {value!r}") from None
+
+    if limit <= 0:
+        raise ValueError(f"Лимит памяти должен быть положительным: {value!r}")
+    return limit
+
+
+def _identity(value):
+    """Возвращает значение без изменений (кодирование по умолчанию)."""
+    return value
+
+
+class SpillingAggregator:
+    """
+    Агрегатор "ключ -> состояние" с ограничением используемой памяти.
+
+    Состояния хранятся в обычном словаре. Перед добавлением нового ключа
+    агрегатор проверяет оценочный объем данных и, если лимит достигнут,
+    сбрасывает отсортированный по ключу словарь во временный файл.
+    Итоговые данные получаются слиянием всех файлов и остатка в памяти,
+    при этом состояния с одинаковым ключом объединяются функцией merge.
+
+    Attributes:
+        memory_limit (int | None): Лимит памяти в байтах, None - без ограничения
+        spilled_runs (int): Количество сброшенных на диск частей
+
+    Methods:
+        get(key): Возвращает изменяемое состояние для ключа
+        add(key, value): Объединяет значение с состоянием ключа
+        items(): Возвращает пары (ключ, состояние)
+        dump(): Сериализует данные в список пар
+        load(pairs): Добавляет сериализованные данные
+
+    Использование:
+        agg = SpillingAggregator(LatencyStats, LatencyStats.merge,
+                                 memory_limit=256 * 1024 ** 2,
+                                 codec=(LatencyStats.to_list, LatencyStats.from_list))
+        agg.get("/api/test").add(0.1)
+    """
+
+    def __init__(self, factory, merge, memory_limit=None, codec=None):
+        """
+        Args:
+            factory (callable): Создает пустое состояние для нового ключа
+            merge (callable): merge(a, b) возвращает объединенное состояние
+            memory_limit (int | None): Лимит памяти в байтах
+            codec (tuple | None): Пара функций (encode, decode) для преобразования
+                                  состояния в JSON-совместимый вид и обратно
+        """
+
+        self._factory = factory
+        self._merge = merge
+        self._codec = codec or (_identity, _identity)
+        self.memory_limit = memory_limit
+        self._data = {}
+        self._used = 0
+        self._runs = []
+
+    @property
+    def spilled_runs(self):
+        """Количество частей, сброшенных во временные файлы."""
+        return len(self._runs)
+
+    def _reserve(self, key, state):
+        """
+        Проверяет лимит памяти перед добавлением нового ключа.
+
+        Размер записи оценивается по размеру ключа, нового состояния
+        и накладным расходам словаря.
+        """
+
+        if self.memory_limit is None:
+            return
+
+        size = sys.getsizeof(key) + sys.getsizeof(state) + _ENTRY_OVERHEAD
+        if self._data and self._used + size > self.memory_limit:
+            self._spill()
+        self._used += size
+
+    def get(self, key):
+        """
+        Возвращает изменяемое состояние для ключа, создавая его при необходимости.
+
+        Args:
+            key (str): Ключ агрегации
+
+        Returns:
+            object: Состояние, созданное фабрикой
+        """
+
+        state = self._data.get(key)
+        if state is None:
+            state = self._factory()
+            self._reserve(key, state)
+            self._data[key] = state
+        return state
+
+    def add(self, key, value):
+        """
+        Объединяет значение с состоянием ключа (для неизменяемых состояний).
+
+        Args:
+            key (str): Ключ агрегации
+            value (object): Частичное состояние, например 1 для счетчика
+        """
+
+        data = self._data
+        if key in data:
+            data[key] = self._merge(data[key], value)
+        else:
+            # Резервирование может сбросить данные и заменить словарь
+            self._reserve(key, value)
+            self._data[key] = value
+
+    def _write_run(self, pairs):
+        """Записывает отсортированные пары (ключ, состояние) во временный файл."""
+
+        run = tempfile.TemporaryFile(mode="w+", encoding="utf-8")
+        encode = self._codec[0]
+        for key, state in pairs:
+            run.write(json.dumps([key, encode(state)], ensure_ascii=False))
+            run.write("\n")
+        return run
+
+    def _spill(self):
+        """
+        Сбрасывает отсортированный словарь во временный файл.
+
+        Части хранятся вместе с уровнем в порядке невозрастания уровней.
+        Когда накапливается _MERGE_FACTOR частей одного уровня, они
+        сливаются в одну часть следующего уровня; части разного размера
+        не сливаются, поэтому большие части не переписываются повторно.
+        """
+
+        data = self._data
+        self._runs.append((0, self._write_run((key, data[key]) for key in sorted(data))))
+        self._data = {}
+        self._used = 0
+
+        runs = self._runs
+        while len(runs) >= _MERGE_FACTOR and runs[-_MERGE_FACTOR][0] == runs[-1][0]:
+            level = runs[-1][0]
+            tier = [run for _, run in runs[-_MERGE_FACTOR:]]
+            del runs[-_MERGE_FACTOR:]
+            runs.append((level + 1, self._write_run(self._merge_runs(tier, {}))))
+
+    def _read_run(self, run):
+        """Читает пары (ключ, состояние) из временного файла."""
+
+        run.seek(0)
+        decode = self._codec[1]
+        for line in run:
+            key, state = json.loads(line)
+            yield key, decode(state)
+
+    def _merge_runs(self, runs, data):
+        """
+        Выполняет k-way слияние временных файлов и словаря в памяти.
+
+        Файлы закрываются (и удаляются) после полного прочтения.
+        """
+
+        sources = [self._read_run(run) for run in runs]
+        sources.append((key, data[key]) for key in sorted(data))
+
+        merge = self._merge
+        current_key = None
+        current = None
+        has_current = False
+        for key, state in heapq.merge(*sources, key=lambda item: item[0]):
+            if has_current and key == current_key:
+                current = merge(current, state)
+                continue
+            if has_current:
+                yield current_key, current
+            current_key, current, has_current = key, state, True
+        if has_current:
+            yield current_key, current
+
+        for run in runs:
+            run.close()
+
+    def __len__(self):
+        """Количество ключей в памяти (без учета сброшенных частей)."""
+        return len(self._data)
+
+    def items(self):
+        """
+        Возвращает пары (ключ, состояние) по всем данным агрегатора.
+
+        Returns:
+            ItemsView | MergedItems: Элементы словаря, если сброса не было,
+                                     иначе ленивый результат k-way слияния
+                                     в порядке сортировки ключей
+
+        Notes:
+            - Если данные сбрасывались на диск, агрегатор после вызова пуст
+        """
+
+        if not self._runs:
+            return self._data.items()
+
+        runs, data = self._runs, self._data
+        self._runs, self._data, self._used = [], {}, 0
+        return MergedItems(self._merge_runs([run for _, run in runs], data))
+
+    def dump(self):
+        """
+        Сериализует все данные агрегатора в JSON-совместимый список.
+
+        Returns:
+            list: Список пар [ключ, закодированное состояние]
+
+        Notes:
+            - Список собирается в памяти целиком (в том числе из сброшенных
+              частей), поэтому memory_limit на этот шаг не распространяется:
+              объем снимка --emit-partial пропорционален числу ключей
+        """
+
+        encode = self._codec[0]
+        return [[key, encode(state)] for key, state in self.items()]
+
+    def load(self, pairs):
+        """
+        Добавляет в агрегатор данные, сериализованные методом dump().
+
+        Args:
+            pairs (list): Список пар [ключ, закодированное состояние]
+        """
+
+        decode = self._codec[1]
+        for key, state in pairs:
+            self.add(key, decode(state))
+
+
+class MergedItems:
+    """
+    Одноразовый ленивый результат слияния сброшенных на диск частей.
+
+    Поддерживает итерацию по парам (ключ, значение) и метод items(),
+    поэтому может передаваться в функции форматирования вместо словаря.
+    Данные читаются с диска по мере итерации и не собираются в памяти.
+
+    Attributes:
+        Нет публичных атрибутов
+
+    Methods:
+        items(): Возвращает итератор пар (ключ, значение)
+        map_values(func): Возвращает новый MergedItems с преобразованными значениями
+    """
+
+    def __init__(self, pairs):
+        self._pairs = pairs
+
+    def __iter__(self):
+        return iter(self._pairs)
+
+    def __bool__(self):
+        # Результат появляется только после сброса непустых данных
+        return True
+
+    def items(self):
+        """Возвращает итератор пар (ключ, значение)."""
+        return iter(self._pairs)
+
+    def map_values(self, func):
+        """
+        Лениво применяет функцию к каждому значению.
+
+        Args:
+            func (callable): Преобразование значения
+
+        Returns:
+            MergedItems: Новый ленивый результат
+        """
+
+        return MergedItems((key, func(value)) for key, value in self._pairs)
@@ -0,0 +1,174 @@
+"""
+Модуль разбора текстовых логов в формате combined/common (nginx, Apache).
+
+Строки формата common:
+
+    127.0.0.1 - - [22/Jun/2025:13:57:32 +0000] "GET /api/users HTTP/1.1" 200 512
+
+и combined (с Referer и User-Agent):
+
+    127.0.0.1 - - [22/Jun/2025:13:57:32 +0000] "GET /api/users HTTP/1.1" 200 512
+    "-" "Mozilla/5.0"
+
+разбираются одним заранее скомпилированным регулярным выражением в словари
+с теми же ключами, что и JSON логи: @timestamp (ISO 8601), status, url,
+request_method, http_user_agent и response_time. После User-Agent допускаются
+другие поля в кавычках (например, "$http_x_forwarded_for" формата main
+в nginx). Время ответа берется из первого числа после полей в кавычках,
+если формат лога дополнен $request_time (nginx); следующие числа, например
+$upstream_response_time, не учитываются.
+
+Формат определяется один раз для файла по первым DETECT_LINES непустым
+строкам (detect_format), поэтому строки JSON логов не проверяются регулярным
+выражением, а строки текстовых логов не передаются в json.loads.
+
+Функции:
+    detect_format(lines): Формат лога по первым непустым строкам
+    parse_clf(line): Разбор строки формата combined/common в словарь
+    clf_date(match): Дата YYYY-MM-DD из совпадения CLF_DATE
+
+Использование:
+    from utils.clf_parser import detect_format, parse_clf
+
+    if detect_format(lines) == "clf":
+        records = [parse_clf(line) for line in lines]
+"""
+
+import re
+from functools import lru_cache
+
+# Строка формата combined/common. Запрос без метода и URL ("-" у некорректных
+# запросов и TLS-проб) допустим; Referer и User-Agent необязательны, за ними могут
+# идти другие поля в кавычках ("$http_x_forwarded_for" формата main в nginx).
+# Время ответа - первое число после полей в кавычках ($request_time перед
+# $upstream_response_time)
+_CLF_LINE = re.compile(
+    r'\S+ \S+ \S+ \[([^\]]+)\] '
+    r'"(?:(\S+) (\S+)[^"]*|[^"]*)" '
+    r'(\d{3}) (?:\d+|-)'
+    r'(?: "[^"]*" "([^"]*)"(?: "[^"]*")*)?'
+    r'(?: (\d+(?:\.\d+)?)(?=\s|$))?(?:\s.*)?$'
+)
+
+# Признак строки combined/common: метка времени в квадратных скобках, за которой
+# следует запрос в кавычках. Проверяется структура, а не вся строка, чтобы
+# строка необычного вида в начале файла не определяла формат как JSON
+_CLF_HINT = re.compile(r'\[\d{2}/[A-Z][a-z]{2}/\d{4}:[^\]]*\] "')
+
+# Количество непустых строк начала файла, по которым определяется формат
+DETECT_LINES = 16
+
+# Дата из метки времени [22/Jun/2025:13:57:32 +0000] в байтах, без разбора строки
+CLF_DATE = re.compile(rb"\[(\d{2})/([A-Z][a-z]{2})/(\d{4}):")
+
+# Номера месяцев в метке времени CLF
+_MONTHS = {
+    "Jan": "01", "Feb": "02", "Mar": "03", "Apr": "04", "May": "05", "Jun": "06",
+    "Jul": "07", "Aug": "08", "Sep": "09", "Oct": "10", "Nov": "11", "Dec": "12",
+}
+
+
+@lru_cache(maxsize=4096)
+def _iso_timestamp(value):
+    """
+    Преобразует метку времени CLF в ISO 8601.
+
+    "22/Jun/2025:13:57:32 +0000" -> "2025-06-22T13:57:32+00:00". Метки
+    соседних строк обычно совпадают, поэтому результат кэшируется.
+    Для некорректных значений возвращается None.
+    """
+
+    month = _MONTHS.get(value[3:6])
+    if month is None or len(value) != 26:
+        return None
+    return f"{value[7:11]}-{month}-{value[0:2]}T{value[12:20]}{value[21:24]}:{value[24:26]}"
+
+
+def clf_date(match):
+    """
+    Возвращает дату YYYY-MM-DD из совпадения регулярного выражения CLF_DATE.
+
+    Args:
+        match (re.Match): Совпадение CLF_DATE
+
+    Returns:
+        str | None: Дата или None для неизвестного месяца
+    """
+
+    day, month, year = (group.decode("ascii") for group in match.groups())
+    month = _MONTHS.get(month)
+    return f"{year}-{month}-{day}" if month else None
+
+
+def detect_format(lines):
+    """
+    Определяет формат лога по первым DETECT_LINES непустым строкам.
+
+    Строка, начинающаяся с "{", считается JSON, строка с меткой времени
+    [dd/Mon/yyyy:...] и запросом в кавычках - combined/common, строки
+    другого вида не учитываются. Выбирается формат большинства строк.
+
+    Args:
+        lines (Iterable[str | bytes]): Строки начала файла
+
+    Returns:
+        str | None: "clf" - большинство строк combined/common, "json" - иначе
+                    (в том числе строки неизвестного формата); None - все
+                    строки пустые
+    """
+
+    votes = {"json": 0, "clf": 0}
+    seen = 0
+    for line in lines:
+        if isinstance(line, bytes):
+            line = line.decode("utf-8", "replace")
+        line = line.strip()
+        if not line:
+            continue
+        if line.startswith("{"):
+            votes["json"] += 1
+        elif _CLF_HINT.search(line):
+            votes["clf"] += 1
+        seen += 1
+        if seen == DETECT_LINES:
+            break
+
+    if not seen:
+        return None
+    return "clf" if votes["clf"] > votes["json"] else "json"
+
+
+def parse_clf(line):
+    """
+    Разбирает строку формата combined/common в словарь с ключами JSON логов.
+
+    Args:
+        line (str | bytes): Строка лога. bytes декодируются как UTF-8
+
+    Returns:
+        dict | None: Словарь с ключами @timestamp, status, url, request_method,
+                     http_user_agent и response_time или None, если строка
+                     не соответствует формату
+
+    Notes:
+        - Для формата common http_user_agent равен None
+        - Для запроса без метода и URL ("-" у некорректных запросов)
+          url и request_method равны None, статус сохраняется
+        - response_time равен None, если после полей в кавычках нет числа
+    """
+
+    if isinstance(line, bytes):
+        line = line.decode("utf-8", "replace")
+    match = _CLF_LINE.match(line)
+    if match is None:
+        return None
+
+    timestamp, method, url, status, user_agent, response_time = match.groups()
+    return {
+        "@timestamp": _iso_timestamp(timestamp),
+        "status": int(status),
+        "url": url,
+        "request_method": method,
+        "response_time": float(response_time) if response_time else None,
+        "http_user_agent": user_agent,
+    }
@@ -0,0 +1,232 @@
+"""
+Модуль выбора файлов логов для анализа.
+
+Этот модуль раскрывает аргументы --file (пути, директории и glob-шаблоны)
+в список файлов и отбрасывает файлы, которые заведомо не содержат
+записей за запрашиваемую дату. Диапазон дат файла определяется по первой
+и последней метке @timestamp (для логов combined/common - по метке
+времени в квадратных скобках), прочитанным из начала и конца файла,
+поэтому сам файл целиком не читается. Конец сжатого файла (.gz)
+недоступен без полной распаковки, поэтому для файлов серии ротации
+(access.log.2.gz, access.log.1, access.log) последняя дата ограничивается
+первой датой следующего, более нового файла серии.
+
+Функции:
+    expand_paths(paths): Раскрытие директорий и glob-шаблонов в список файлов
+    file_date_range(path): Даты первой и последней записи файла
+    prune_files(files, filter_date): Отбор файлов, которые нужно прочитать
+
+Использование:
+    from utils.file_selector import expand_paths, prune_files
+
+    files = expand_paths(["/var/log/nginx/access.log*"])
+    files = prune_files(files, "2025-06-22")
+"""
+
+import glob
+import gzip
+import os
+import re
+
+from utils.clf_parser import CLF_DATE, clf_date
+from utils.log_parser import _TIMESTAMP_DATE
+
+# Размер начала и конца файла, в которых ищется @timestamp, байт
+_PROBE_SIZE = 64 * 1024
+
+# Номер файла серии ротации: access.log.3 или access.log.3.gz
+_ROTATION = re.compile(r"^(.*)\.(\d+)(?:\.gz)?$")
+
+
+def expand_paths(paths):
+    """
+    Раскрывает директории и glob-шаблоны в список файлов.
+
+    Args:
+        paths (list[str]): Пути к файлам, директориям или glob-шаблоны
+
+    Returns:
+        list[str]: Пути к файлам в порядке аргументов; файлы директории и
+                   совпадения шаблона отсортированы по имени. Пути без
+                   шаблона возвращаются как есть, чтобы отсутствующий
+                   файл приводил к FileNotFoundError при чтении.
+
+    Notes:
+        - Директории раскрываются без рекурсии, скрытые файлы пропускаются
+        - Файл, попавший под несколько аргументов, возвращается один раз
+    """
+
+    files = []
+    seen = set()
+    for path in paths:
+        if os.path.isdir(path):
+            matches = sorted(
+                os.path.join(path, name) for name in os.listdir(path)
+                if not name.startswith(".") and os.path.isfile(os.path.join(path, name))
+            )
+        elif glob.has_magic(path):
+            matches = sorted(match for match in glob.glob(path) if os.path.isfile(match))
+        else:
+            matches = [path]
+
+        for match in matches:
+            if match not in seen:
+                seen.add(match)
+                files.append(match)
+    return files
+
+
+def _first_date(data):
+    """Возвращает дату первой метки @timestamp (или метки CLF) в байтах или None."""
+    match = _TIMESTAMP_DATE.search(data)
+    if match:
+        return match.group(1).decode("ascii")
+    match = CLF_DATE.search(data)
+    return clf_date(match) if match else None
+
+
+def _last_date(data):
+    """Возвращает дату последней метки @timestamp (или метки CLF) в байтах или None."""
+    last = None
+    for match in _TIMESTAMP_DATE.finditer(data):
+        last = match
+    if last:
+        return last.group(1).decode("ascii")
+    for match in CLF_DATE.finditer(data):
+        last = match
+    return clf_date(last) if last else None
+
+
+def file_date_range(path):
+    """
+    Определяет даты первой и последней записи файла.
+
+    Читает не более 64 КБ из начала и из конца файла. Для сжатых файлов
+    (.gz) читается только начало: конец недоступен без распаковки всего файла.
+
+    Args:
+        path (str): Путь к файлу лога
+
+    Returns:
+        tuple[str | None, str | None]: Даты YYYY-MM-DD первой и последней
+                                       записи; None, если дату определить
+                                       не удалось
+
+    Raises:
+        FileNotFoundError: Если файл не существует
+    """
+
+    if path.endswith(".gz"):
+        with gzip.open(path, "rb") as f:
+            try:
+                return _first_date(f.read(_PROBE_SIZE)), None
+            except (OSError, EOFError):
+                return None, None
+
+    with open(path, "rb") as f:
+        head = f.read(_PROBE_SIZE)
+        size = os.fstat(f.fileno()).st_size
+        if size <= _PROBE_SIZE:
+            tail = head
+        else:
+            f.seek(size - _PROBE_SIZE)
+            tail = f.read(_PROBE_SIZE)
+    return _first_date(head), _last_date(tail)
+
+
+def _newer_rotation(path):
+    """
+    Возвращает путь к следующему, более новому файлу серии ротации.
+
+    Для access.log.3.gz это access.log.2.gz или access.log.2, для
+    access.log.1 - access.log. None, если путь не относится к серии
+    или более нового файла нет.
+    """
+
+    match = _ROTATION.match(path)
+    if match is None:
+        return None
+    base, number = match.group(1), int(match.group(2))
+    candidates = [base] if number == 1 else [f"{base}.{number - 1}", f"{base}.{number - 1}.gz"]
+    for candidate in candidates:
+        if os.path.isfile(candidate):
+            return candidate
+    return None
+
+
+def _rotation_last_date(path, date_range):
+    """
+    Возвращает верхнюю границу последней даты файла серии ротации.
+
+    Записи файла предшествуют записям более новых файлов серии, поэтому
+    последняя дата не позже первой даты ближайшего более нового файла,
+    дату которого удалось определить (пустые файлы пропускаются).
+
+    Args:
+        path (str): Путь к файлу серии ротации
+        date_range (callable): Функция path -> (первая дата, последняя дата)
+
+    Returns:
+        str | None: Дата YYYY-MM-DD или None, если границу определить не удалось
+    """
+
+    newer = _newer_rotation(path)
+    while newer is not None:
+        first = date_range(newer)[0]
+        if first is not None:
+            return first
+        newer = _newer_rotation(newer)
+    return None
+
+
+def prune_files(files, filter_date=None):
+    """
+    Возвращает файлы для чтения с учетом фильтра по дате.
+
+    Файл пропускается, если его первая запись позже filter_date или
+    последняя запись раньше filter_date. Предполагается, что записи
+    в файле упорядочены по времени, как в логах с ротацией.
+
+    Args:
+        files (list[str]): Пути к файлам (см. expand_paths)
+        filter_date (str | None): Дата в формате YYYY-MM-DD.
+                                  Если None - отбор по дате не выполняется.
+
+    Returns:
+        list[str]: Пути к файлам, которые нужно прочитать
+
+    Notes:
+        - Файлы, для которых дату определить не удалось, не пропускаются
+        - Отсутствующие файлы не пропускаются, чтобы ошибка возникла при чтении
+        - Если последнюю дату прочитать нельзя (.gz), для файла серии
+          ротации она ограничивается первой датой более нового файла
+    """
+
+    if not filter_date:
+        return list(files)
+
+    # Начало каждого файла читается не больше одного раза, в том числе
+    # для границ последней даты соседних файлов серии
+    ranges = {}
+
+    def date_range(path):
+        if path not in ranges:
+            ranges[path] = file_date_range(path)
+        return ranges[path]
+
+    selected = []
+    for path in files:
+        try:
+            first, last = date_range(path)
+            if last is None:
+                last = _rotation_last_date(path, date_range)
+        except OSError:
+            selected.append(path)
+            continue
+
+        if first is not None and first > filter_date:
+            continue
+        if last is not None and last < filter_date:
+            continue
+        selected.append(path)
+    return selected
@@ -2,12 +2,13 @@
 Модуль для парсинга и фильтрации логов веб-сервера
 
 Этот модуль предоставляет утилиты для загрузки, парсинга и фильтрации
-лог-файлов в JSON формате. Основная функция - итеративная обработка
+лог-файлов в JSON формате и в текстовом формате combined/common
+(см. utils.clf_parser). Основная функция - итеративная обработка
 больших лог-файлов без загрузки всего файла в память.
 
 Функции:
     _try_parse_json(line): Безопасный парсинг JSON строки
-    load_lines(files, filter_date): Генератор для чтения и фильтрации логов
+    load_lines(files, filter_date, reader): Генератор для чтения и фильтрации логов
 
 Использование:
     from utils.log_parser import load_lines, _try_parse_json
@@ -15,11 +16,39 @@
     # Чтение логов с фильтрацией по дате
     lines = list(load_lines(["access.log"], "2024-01-15"))
 
+    # Чтение в байтовом режиме (строки вне даты отбрасываются без декодирования)
+    lines = load_lines(["access.log"], "2024-01-15", reader="bytes")
+
+    # Чтение через отображение файла в память (mmap)
+    lines = load_lines(["access.log"], reader="mmap")
+
+    # Чтение до 4 блоков наперед в фоновом потоке
+    lines = load_lines(["access.log"], reader="bytes", prefetch_depth=4)
+
     # Безопасный парсинг отдельной строки
     parsed_line = _try_parse_json('{"url": "/test", "status": 200}')
 """
 
+import gzip
 import json
+import mmap
+import os
+import re
+import stat
+from itertools import chain, islice
+
+from utils.clf_parser import DETECT_LINES, detect_format, parse_clf
+from utils.prefetch import prefetch
+
+# Размер блока для чтения файла в байтовом режиме
+_BLOCK_SIZE = 1024 * 1024
+
+# Дата из поля @timestamp, извлекаемая без разбора всей JSON строки. Дата
+# учитывается, только если за ней следует "T" или конец значения (см. _timestamp_date)
+_TIMESTAMP_DATE = re.compile(rb'"@timestamp"\s*:\s*"(\d{4}-\d{2}-\d{2})(?:T|")')
+
+# Поддерживаемые способы чтения файлов
+READERS = ("text", "bytes", "mmap")
 
 def _try_parse_json(line):
     """
@@ -29,7 +58,8 @@ def _try_parse_json(line):
      в словарь Python. В случае ошибки парсинга возвращает None.
 
      Args:
-         line (str): Строка в JSON формате для парсинга
+         line (str | bytes): Строка в JSON формате для парсинга.
+                             bytes декодируются как UTF-8
 
      Returns:
          dict | None: Распарсенный объект или None при ошибке
@@ -39,13 +69,237 @@ def _try_parse_json(line):
     """
 
     try:
+        if isinstance(line, bytes):
+            # Явное декодирование быстрее автоопределения кодировки в json.loads
+            line = line.decode("utf-8")
         return json.loads(line)
     except (json.JSONDecodeError, TypeError, ValueError):
         # Обрабатываем конкретные ошибки парсинга JSON
         return None
 
 
-def load_lines(files, filter_date: str | None = None):
+def _timestamp_date(timestamp):
+    """
+    Возвращает дату YYYY-MM-DD из значения @timestamp.
+
+    Дата - первые 10 символов, за которыми следует "T" или конец строки.
+    Одно и то же правило применяется при разборе JSON и при поиске даты
+    по байтам (_TIMESTAMP_DATE), поэтому все способы чтения отбирают
+    одинаковые строки.
+
+    Args:
+        timestamp (object): Значение поля @timestamp
+
+    Returns:
+        str | None: Дата или None, если значение не в формате ISO 8601
+    """
+
+    if isinstance(timestamp, str) and timestamp[10:11] in ("T", ""):
+        return timestamp[:10]
+    return None
+
+
+def _matches_date(line, filter_date):
+    """
+    Проверяет, относится ли строка лога к указанной дате.
+
+    Args:
+        line (str | bytes): Строка лога в JSON формате
+        filter_date (str): Дата в формате YYYY-MM-DD
+
+    Returns:
+        bool: False для строк, которые не парсятся как JSON, и для строк
+              с другой датой в @timestamp; True в остальных случаях
+    """
+
+    # Парсим строку чтобы извлечь timestamp
+    obj = _try_parse_json(line)
+    if obj is None:
+        # Пропускаем строки которые не парсятся как JSON
+        return False
+
+    # Проверяем наличие timestamp и сравниваем даты
+    if obj:
+        ts = obj.get("@timestamp")
+        if ts and _timestamp_date(ts) != filter_date:
+            # Пропускаем строки не подходящие под фильтр даты
+            return False
+    return True
+
+
+def _iter_line_blocks(f, block_size=_BLOCK_SIZE):
+    """
+    Читает бинарный файл большими блоками и разбивает их на строки.
+
+    Строки возвращаются списками (по одному на блок) как bytes без символа
+    перевода строки, чтобы вызывающий код обрабатывал их пакетно.
+    Хвост блока без перевода строки переносится в следующий блок.
+
+    Args:
+        f (BinaryIO): Файл, открытый в режиме "rb"
+        block_size (int): Размер читаемого блока в байтах
+
+    Yields:
+        list[bytes]: Полные строки очередного блока
+    """
+
+    tail = b""
+    while True:
+        block = f.read(block_size)
+        if not block:
+            break
+        if tail:
+            block = tail + block
+
+        # split выполняется целиком в C, последний элемент - неполная строка
+        lines = block.split(b"\n")
+        tail = lines.pop()
+        yield lines
+
+    if tail:
+        yield [tail]
+
+
+def _iter_mmap_blocks(mm, block_size=_BLOCK_SIZE):
+    """
+    Разбивает отображенный в память файл на строки блоками.
+
+    Граница блока выравнивается по последнему переводу строки, поэтому
+    хвосты не склеиваются, а чтение выполняется без системных вызовов read:
+    страницы файла подгружаются ядром по мере обращения.
+
+    Args:
+        mm (mmap.mmap): Отображение файла
+        block_size (int): Примерный размер блока в байтах
+
+    Yields:
+        list[bytes]: Полные строки очередного блока
+    """
+
+    size = len(mm)
+    start = 0
+    while start < size:
+        end = min(start + block_size, size)
+        if end < size:
+            newline = mm.rfind(b"\n", start, end)
+            if newline == -1:
+                # Строка длиннее блока - ищем ее конец дальше
+                newline = mm.find(b"\n", end)
+            end = size if newline == -1 else newline + 1
+
+        lines = mm[start:end].split(b"\n")
+        if not lines[-1]:
+            lines.pop()
+        yield lines
+        start = end
+
+
+def _iter_file_blocks(file, use_mmap=False):
+    """
+    Открывает файл и возвращает его строки блоками.
+
+    Сжатые файлы (.gz) читаются через gzip. При use_mmap обычные непустые
+    файлы отображаются в память; каналы, сокеты, пустые и сжатые файлы
+    читаются буферизованными блоками.
+
+    Args:
+        file (str): Путь к файлу
+        use_mmap (bool): Использовать отображение файла в память
+
+    Yields:
+        list[bytes]: Полные строки очередного блока
+    """
+
+    if file.endswith(".gz"):
+        with gzip.open(file, "rb") as f:
+            yield from _iter_line_blocks(f)
+        return
+
+    with open(file, "rb") as f:
+        st = os.fstat(f.fileno())
+        if not use_mmap or not stat.S_ISREG(st.st_mode) or st.st_size == 0:
+            yield from _iter_line_blocks(f)
+            return
+
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            if hasattr(mm, "madvise"):
+                # Подсказываем ядру последовательное чтение для read-ahead
+                mm.madvise(mmap.MADV_SEQUENTIAL)
+            yield from _iter_mmap_blocks(mm)
+
+
+def _iter_blocks(files, use_mmap=False):
+    """
+    Возвращает блоки строк всех файлов по порядку вместе с форматом файла.
+
+    Формат определяется один раз по первым непустым строкам первого
+    непустого блока файла (см. utils.clf_parser.detect_format).
+
+    Yields:
+        tuple[str | None, list[bytes]]: Формат файла и блок строк
+    """
+
+    for file in files:
+        log_format = None
+        for lines in _iter_file_blocks(file, use_mmap):
+            if log_format is None:
+                log_format = detect_format(lines)
+            yield log_format, lines
+
+
+def _filter_records(records, filter_date):
+    """Отбрасывает неразобранные строки и записи с другой датой в @timestamp."""
+    for record in records:
+        if record is None:
+            continue
+        timestamp = record["@timestamp"]
+        if filter_date and timestamp and _timestamp_date(timestamp) != filter_date:
+            continue
+        yield record
+
+
+def _load_byte_lines(files, filter_date, use_mmap=False, prefetch_depth=0):
+    """
+    Байтовый режим load_lines: чтение блоками в bytes.
+
+    Пустые строки отбрасываются на уровне байтов, дата проверяется
+    регулярным выражением по байтам без разбора JSON. Полный разбор
+    выполняется только для строк, где @timestamp не найден. Строки,
+    прошедшие фильтр, возвращаются в bytes и декодируются целиком при
+    разборе JSON (см. _try_parse_json), поэтому экономия - это только
+    декодирование и разбор строк, отклоненных фильтром по дате. Строки
+    файлов формата combined/common возвращаются разобранными словарями.
+    При prefetch_depth > 0 блоки читаются наперед в фоновом потоке.
+    """
+
+    date = filter_date.encode("ascii") if filter_date else None
+    search_date = _TIMESTAMP_DATE.search
+
+    for log_format, lines in prefetch(_iter_blocks(files, use_mmap), prefetch_depth):
+        # Пропускаем пустые строки без создания новых объектов
+        lines = [line for line in lines if line and not line.isspace()]
+
+        if log_format == "clf":
+            # Строки combined/common разбираются сразу в словари
+            yield from _filter_records(map(parse_clf, lines), filter_date)
+            continue
+
+        if date is None:
+            yield from lines
+            continue
+
+        for line in lines:
+            match = search_date(line)
+            if match is not None:
+                if match.group(1) != date:
+                    continue
+            elif not _matches_date(line, filter_date):
+                continue
+            yield line
+
+
+def load_lines(files, filter_date: str | None = None, reader: str = "text",
+               prefetch_depth: int = 0):
     """
     Генератор для чтения и фильтрации лог-файлов.
 
@@ -57,9 +311,21 @@ def load_lines(files, filter_date: str | None = None):
         files (list[str]): Список путей к файлам логов
         filter_date (str | None): Дата для фильтрации в формате YYYY-MM-DD.
                                  Если None - фильтрация не применяется.
+        reader (str): Способ чтения файлов:
+                      - "text" - построчное чтение в str (UTF-8)
+                      - "bytes" - чтение блоками в bytes; пустые строки и
+                        строки с другой датой отбрасываются без декодирования
+                        и разбора JSON, остальные декодируются при разборе
+                      - "mmap" - как "bytes", но обычные файлы отображаются
+                        в память; каналы и .gz читаются блоками
+        prefetch_depth (int): Количество блоков, читаемых наперед в фоновом
+                              потоке (только для "bytes" и "mmap").
+                              0 - чтение в текущем потоке
 
     Yields:
-        str: Строка лога, прошедшая фильтрацию (если aplicable)
+        str | bytes | dict: Строка лога, прошедшая фильтрацию (если aplicable).
+                            Строки файлов формата combined/common возвращаются
+                            словарями с ключами JSON логов (см. utils.clf_parser)
 
     Raises:
         FileNotFoundError: Если файл не существует
@@ -67,35 +333,46 @@ def load_lines(files, filter_date: str | None = None):
 
     Notes:
         - Пропускает пустые строки
-        - Фильтрация работает только для JSON логов с полем @timestamp
+        - Фильтрация работает для JSON логов с полем @timestamp и для
+          логов формата combined/common
+        - Формат определяется один раз для каждого файла по первым
+          непустым строкам (см. utils.clf_parser.detect_format); в файлах
+          combined/common строки другого формата пропускаются
         - Использует кодировку UTF-8 для чтения файлов
         - Работает как генератор для экономии памяти
+        - Файлы .gz распаковываются на лету во всех режимах
+        - В режимах "bytes" и "mmap" строки возвращаются без символа перевода
+          строки
     """
 
+    if reader in ("bytes", "mmap"):
+        yield from _load_byte_lines(files, filter_date, reader == "mmap", prefetch_depth)
+        return
+    if reader != "text":
+        raise ValueError(f"Неизвестный способ чтения: {reader!r}")
+    if prefetch_depth > 0:
+        raise ValueError("Чтение наперед поддерживается только в режимах bytes и mmap")
+
     # Обрабатываем каждый файл в списке
     for file in files:
-        # Открываем файл с указанием кодировки UTF-8
-        with open(file, encoding="utf-8") as f:
-            # Читаем файл построчно
-            for line in f:
-                # Пропускаем пустые строки
-                if not line.strip():
+        # Открываем файл с указанием кодировки UTF-8; .gz распаковывается на лету
+        opener = gzip.open if file.endswith(".gz") else open
+        with opener(file, "rt", encoding="utf-8") as f:
+            # Читаем файл построчно, пропуская пустые строки
+            lines = (line for line in f if line.strip())
+
+            # Формат файла определяется по первым непустым строкам
+            head = list(islice(lines, DETECT_LINES))
+            log_format = detect_format(head)
+
+            for line in chain(head, lines):
+                if log_format == "clf":
+                    yield from _filter_records([parse_clf(line)], filter_date)
                     continue
 
                 # Применяем фильтрацию по дате если указана
-                if filter_date:
-                    # Парсим строку чтобы извлечь timestamp
-                    obj = _try_parse_json(line)
-                    if obj is None:
-                        # Пропускаем строки которые не парсятся как JSON
-                        continue
-
-                    # Проверяем наличие timestamp и сравниваем даты
-                    if obj:
-                        ts = obj.get("@timestamp")
-                        if ts and ts.split("T")[0] != filter_date:
-                            # Пропускаем строки не подходящие под фильтр даты
-                            continue
+                if filter_date and not _matches_date(line, filter_date):
+                    continue
 
                 # Возвращаем строку через генератор
                 yield line
@@ -0,0 +1,272 @@
+"""
+Модуль компактного представления записей лога.
+
+Вместо словаря, который создает json.loads для каждой строки, отчеты
+получают записи с фиксированным набором полей, типы которых приводятся
+один раз при разборе: status - int, response_time - float. Для пакетной
+обработки записи собираются в RecordBatch, где числовые поля хранятся
+в колонках array, а строковые - в списках.
+
+Классы:
+    LogRecord: Запись лога со __slots__
+    RecordBatch: Пакет записей в колоночном виде
+
+Функции:
+    parse_record(line): Разбор строки лога в LogRecord
+    iter_batches(lines, size): Разбор строк лога в пакеты RecordBatch
+
+Использование:
+    from utils.record import iter_batches, parse_record
+
+    record = parse_record('{"url": "/api", "status": "200", "response_time": "0.1"}')
+    record.status         # 200
+    record.response_time  # 0.1
+
+    for batch in iter_batches(lines):
+        for url, rt in zip(batch.urls, batch.response_times):
+            ...
+"""
+
+import math
+from array import array
+from dataclasses import dataclass
+
+from utils.log_parser import _try_parse_json
+
+# Количество записей в пакете по умолчанию
+BATCH_SIZE = 4096
+
+# Значение колонки statuses для записей без статус-кода
+MISSING_STATUS = -1
+
+# Верхняя граница статус-кода, помещающегося в array("i")
+_STATUS_LIMIT = 2 ** 31
+
+# Значение колонки response_times для записей без времени ответа
+MISSING_TIME = math.nan
+
+
+def _to_status(value):
+    """Приводит статус-код к неотрицательному int (помещающемуся в array "i") или None."""
+    if value is None:
+        return None
+    try:
+        result = int(value)
+    except (TypeError, ValueError):
+        return None
+    return result if 0 <= result < _STATUS_LIMIT else None
+
+
+def _to_float(value):
+    """Приводит значение к конечному float или возвращает None."""
+    if value is None:
+        return None
+    try:
+        result = float(value)
+    except (TypeError, ValueError):
+        return None
+    return result if math.isfinite(result) else None
+
+
+def _to_str(value):
+    """Возвращает непустую строку или None."""
+    return value if isinstance(value, str) and value else None
+
+
+@dataclass(slots=True)
+class LogRecord:
+    """
+    Запись лога с нормализованными типами полей.
+
+    Attributes:
+        timestamp (str | None): Значение @timestamp
+        status (int | None): HTTP статус-код
+        url (str | None): URL запроса
+        method (str | None): HTTP метод (request_method)
+        response_time (float | None): Время ответа в секундах
+        user_agent (str | None): Строка User-Agent (http_user_agent)
+
+    Methods:
+        from_dict(obj): Создает запись из распарсенного JSON словаря
+    """
+
+    timestamp: str | None = None
+    status: int | None = None
+    url: str | None = None
+    method: str | None = None
+    response_time: float | None = None
+    user_agent: str | None = None
+
+    @classmethod
+    def from_dict(cls, obj):
+        """
+        Создает запись из распарсенного JSON словаря.
+
+        Args:
+            obj (dict): Словарь записи лога
+
+        Returns:
+            LogRecord: Запись; поля с некорректными значениями равны None
+        """
+
+        return cls(
+            timestamp=_to_str(obj.get("@timestamp")),
+            status=_to_status(obj.get("status")),
+            url=_to_str(obj.get("url")),
+            method=_to_str(obj.get("request_method")),
+            response_time=_to_float(obj.get("response_time")),
+            user_agent=_to_str(obj.get("http_user_agent")),
+        )
+
+
+def parse_record(line):
+    """
+    Разбирает строку лога в LogRecord.
+
+    Args:
+        line (str | bytes | dict): Строка лога в JSON формате или уже
+                                  разобранная запись (см. utils.clf_parser)
+
+    Returns:
+        LogRecord | None: Запись или None, если строка не является JSON объектом
+    """
+
+    obj = line if line.__class__ is dict else _try_parse_json(line)
+    if not isinstance(obj, dict) or not obj:
+        return None
+    return LogRecord.from_dict(obj)
+
+
+class RecordBatch:
+    """
+    Пакет записей лога в колоночном виде.
+
+    Числовые поля хранятся в array без отдельного объекта на каждое
+    значение: statuses - array("i") с MISSING_STATUS для отсутствующих
+    кодов, response_times - array("d") с NaN для отсутствующего времени.
+    Строковые поля хранятся в списках, отсутствующие значения - None
+    (пустые строки сохраняются, отчеты проверяют значения на истинность).
+
+    Attributes:
+        timestamps (list[str | None]): Колонка @timestamp
+        statuses (array): Колонка статус-кодов
+        urls (list[str | None]): Колонка URL
+        methods (list[str | None]): Колонка HTTP методов
+        response_times (array): Колонка времени ответа
+        user_agents (list[str | None]): Колонка User-Agent
+
+    Methods:
+        append(obj): Добавляет запись из распарсенного JSON словаря
+        append_record(record): Добавляет LogRecord
+        __iter__(): Возвращает записи пакета как LogRecord
+    """
+
+    __slots__ = ("timestamps", "statuses", "urls", "methods", "response_times", "user_agents")
+
+    def __init__(self):
+        self.timestamps = []
+        self.statuses = array("i")
+        self.urls = []
+        self.methods = []
+        self.response_times = array("d")
+        self.user_agents = []
+
+    def __len__(self):
+        return len(self.urls)
+
+    def append(self, obj):
+        """
+        Добавляет запись из распарсенного JSON словаря без создания LogRecord.
+
+        Args:
+            obj (dict): Словарь записи лога
+        """
+
+        get = obj.get
+
+        # Быстрый путь для типов, которые дает json.loads; остальное - через _to_*
+        status = get("status")
+        if status.__class__ is not int or not 0 <= status < _STATUS_LIMIT:
+            status = _to_status(status)
+            if status is None:
+                status = MISSING_STATUS
+
+        rt = get("response_time")
+        # rt - rt == 0 ложно для NaN и бесконечностей
+        if rt.__class__ is not float or rt - rt != 0.0:
+            rt = _to_float(rt)
+            if rt is None:
+                rt = MISSING_TIME
+
+        self.statuses.append(status)
+        self.response_times.append(rt)
+
+        # Нестроковые значения заменяются на None, пустые строки сохраняются
+        value = get("@timestamp")
+        self.timestamps.append(value if value.__class__ is str else None)
+        value = get("url")
+        self.urls.append(value if value.__class__ is str else None)
+        value = get("request_method")
+        self.methods.append(value if value.__class__ is str else None)
+        value = get("http_user_agent")
+        self.user_agents.append(value if value.__class__ is str else None)
+
+    def append_record(self, record):
+        """
+        Добавляет запись LogRecord.
+
+        Args:
+            record (LogRecord): Запись лога
+        """
+
+        self.timestamps.append(record.timestamp)
+        self.statuses.append(MISSING_STATUS if record.status is None else record.status)
+        self.urls.append(record.url)
+        self.methods.append(record.method)
+        self.response_times.append(
+            MISSING_TIME if record.response_time is None else record.response_time
+        )
+        self.user_agents.append(record.user_agent)
+
+    def __iter__(self):
+        columns = zip(self.timestamps, self.statuses, self.urls, self.methods,
+                      self.response_times, self.user_agents)
+        for timestamp, status, url, method, rt, user_agent in columns:
+            yield LogRecord(
+                timestamp=timestamp,
+                status=None if status == MISSING_STATUS else status,
+                url=url,
+                method=method,
+                response_time=None if math.isnan(rt) else rt,
+                user_agent=user_agent,
+            )
+
+
+def iter_batches(lines, size=BATCH_SIZE):
+    """
+    Разбирает строки лога и группирует записи в пакеты.
+
+    Args:
+        lines (Iterable[str | bytes | dict]): Строки лога в JSON формате или
+                                              уже разобранные записи (dict)
+        size (int): Максимальное количество записей в пакете
+
+    Yields:
+        RecordBatch: Очередной непустой пакет записей
+
+    Notes:
+        - Строки, которые не являются JSON объектом, пропускаются
+    """
+
+    batch = RecordBatch()
+    for line in lines:
+        # Строки текстовых форматов приходят из load_lines уже разобранными
+        obj = line if line.__class__ is dict else _try_parse_json(line)
+        if not isinstance(obj, dict) or not obj:
+            continue
+        batch.append(obj)
+        if len(batch) >= size:
+            yield batch
+            batch = RecordBatch()
+    if len(batch):
+        yield batch
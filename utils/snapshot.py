@@ -0,0 +1,116 @@
+"""
+Модуль сериализации частичных состояний отчетов (snapshot).
+
+Снимок позволяет собрать не финализированные агрегаты отчетов на каждом
+узле, передать по сети только их (килобайты вместо сырых логов) и
+объединить на одном узле. Формат бинарный и версионированный:
+
+    MAGIC (4 байта) | версия формата (uint16, big-endian) | zlib(JSON)
+
+JSON содержит словарь {"reports": {имя_отчета: dump_state(...)}}.
+
+Функции:
+    encode_snapshot(states): Кодирует состояния в байты снимка
+    decode_snapshot(data): Декодирует байты снимка в состояния
+    write_snapshot(path, states): Записывает снимок в файл
+    read_snapshot(path): Читает снимок из файла
+
+Использование:
+    from utils.snapshot import read_snapshot, write_snapshot
+
+    write_snapshot("edge1.bin", {"average": report.dump_state(state)})
+    states = read_snapshot("edge1.bin")
+"""
+
+import json
+import struct
+import zlib
+
+# Сигнатура файла снимка
+MAGIC = b"WMLP"
+
+# Текущая версия формата снимка
+FORMAT_VERSION = 1
+
+_HEADER = struct.Struct(">4sH")
+
+
+def encode_snapshot(states):
+    """
+    Кодирует сериализованные состояния отчетов в байты снимка.
+
+    Args:
+        states (dict): Словарь {имя_отчета: JSON-совместимое состояние}
+
+    Returns:
+        bytes: Содержимое снимка
+    """
+
+    payload = json.dumps({"reports": states}, ensure_ascii=False, separators=(",", ":"))
+    return _HEADER.pack(MAGIC, FORMAT_VERSION) + zlib.compress(payload.encode("utf-8"))
+
+
+def decode_snapshot(data):
+    """
+    Декодирует байты снимка в сериализованные состояния отчетов.
+
+    Args:
+        data (bytes): Содержимое снимка
+
+    Returns:
+        dict: Словарь {имя_отчета: JSON-совместимое состояние}
+
+    Raises:
+        ValueError: Если данные не являются снимком, версия формата
+                    не поддерживается или содержимое повреждено
+    """
+
+    if len(data) < _HEADER.size:
+        raise ValueError("Файл слишком короткий для снимка")
+
+    magic, version = _HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise ValueError("Файл не является снимком частичных агрегатов")
+    if version != FORMAT_VERSION:
+        raise ValueError(f"Неподдерживаемая версия снимка: {version}")
+
+    try:
+        payload = json.loads(zlib.decompress(data[_HEADER.size:]))
+    except (zlib.error, ValueError) as exc:
+        raise ValueError(f"Поврежденный снимок: {exc}") from exc
+
+    if not isinstance(payload, dict) or not isinstance(payload.get("reports"), dict):
+        raise ValueError("Поврежденный снимок: нет словаря состояний отчетов")
+    return payload["reports"]
+
+
+def write_snapshot(path, states):
+    """
+    Записывает снимок частичных состояний в файл.
+
+    Args:
+        path (str): Путь к файлу снимка
+        states (dict): Словарь {имя_отчета: JSON-совместимое состояние}
+    """
+
+    with open(path, "wb") as f:
+        f.write(encode_snapshot(states))
+
+
+def read_snapshot(path):
+    """
+    Читает снимок частичных состояний из файла.
+
+    Args:
+        path (str): Путь к файлу снимка
+
+    Returns:
+        dict: Словарь {имя_отчета: JSON-совместимое состояние}
+
+    Raises:
+        OSError: Если файл не существует или не читается
+        ValueError: Если файл не является корректным снимком
+    """
+
+    with open(path, "rb") as f:
+        return decode_snapshot(f.read())
@@ -0,0 +1,173 @@
+"""
+Модуль потоковой статистики времени ответа.
+
+Этот модуль предоставляет класс LatencyStats, который за один проход
+вычисляет количество, сумму, минимум, максимум, дисперсию и стандартное
+отклонение. Среднее и дисперсия считаются по алгоритму Уэлфорда, сумма -
+компенсированным суммированием Ноймайера, поэтому точность не теряется
+на сотнях миллионов малых значений. Частичные результаты (разные файлы
+или воркеры) объединяются по формулам Чана без потери точности.
+
+Классы:
+    LatencyStats: Объединяемая потоковая статистика
+
+Использование:
+    from utils.stats import LatencyStats
+
+    stats = LatencyStats()
+    for rt in (0.1, 0.2, 0.3):
+        stats.add(rt)
+    print(stats.mean, stats.stddev)
+"""
+
+import math
+
+
+def _neumaier_add(total, compensation, value):
+    """
+    Шаг компенсированного суммирования Ноймайера.
+
+    Args:
+        total (float): Текущая сумма
+        compensation (float): Накопленная поправка округления
+        value (float): Добавляемое значение
+
+    Returns:
+        tuple[float, float]: Новые сумма и поправка
+    """
+
+    result = total + value
+    if abs(total) >= abs(value):
+        compensation += (total - result) + value
+    else:
+        compensation += (value - result) + total
+    return result, compensation
+
+
+class LatencyStats:
+    """
+    Потоковая статистика времени ответа с поддержкой объединения.
+
+    Attributes:
+        count (int): Количество значений
+        total (float): Сумма значений (без поправки)
+        compensation (float): Поправка компенсированного суммирования
+        mean (float): Среднее по Уэлфорду
+        m2 (float): Сумма квадратов отклонений от среднего
+        min (float): Минимальное значение
+        max (float): Максимальное значение
+
+    Methods:
+        add(value): Добавляет одно значение
+        merge(a, b): Объединяет две статистики (формулы Чана)
+        to_list(): Сериализует состояние в список
+        from_list(data): Восстанавливает состояние из списка
+    """
+
+    __slots__ = ("count", "total", "compensation", "mean", "m2", "min", "max")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.compensation = 0.0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, value):
+        """
+        Добавляет одно значение (шаг алгоритма Уэлфорда).
+
+        Args:
+            value (float): Время ответа в секундах
+        """
+
+        self.count += 1
+        self.total, self.compensation = _neumaier_add(self.total, self.compensation, value)
+
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+    @staticmethod
+    def merge(a, b):
+        """
+        Объединяет две статистики по формулам параллельного алгоритма Чана.
+
+        Args:
+            a (LatencyStats): Первая статистика (изменяется и возвращается)
+            b (LatencyStats): Вторая статистика
+
+        Returns:
+            LatencyStats: Объединенная статистика
+        """
+
+        if not b.count:
+            return a
+        if not a.count:
+            return b
+
+        count = a.count + b.count
+        delta = b.mean - a.mean
+        a.mean += delta * b.count / count
+        a.m2 += b.m2 + delta * delta * a.count * b.count / count
+
+        a.total, a.compensation = _neumaier_add(a.total, a.compensation, b.total)
+        a.compensation += b.compensation
+
+        a.min = min(a.min, b.min)
+        a.max = max(a.max, b.max)
+        a.count = count
+        return a
+
+    @property
+    def sum(self):
+        """Сумма значений с учетом поправки округления."""
+        return self.total + self.compensation
+
+    @property
+    def average(self):
+        """Среднее, вычисленное по компенсированной сумме."""
+        return self.sum / self.count if self.count else 0.0
+
+    @property
+    def variance(self):
+        """Дисперсия генеральной совокупности (m2 / count)."""
+        return self.m2 / self.count if self.count else 0.0
+
+    @property
+    def stddev(self):
+        """Стандартное отклонение."""
+        return math.sqrt(self.variance)
+
+    def to_list(self):
+        """
+        Сериализует состояние в JSON-совместимый список.
+
+        Returns:
+            list: [count, total, compensation, mean, m2, min, max]
+        """
+
+        return [self.count, self.total, self.compensation,
+                self.mean, self.m2, self.min, self.max]
+
+    @classmethod
+    def from_list(cls, data):
+        """
+        Восстанавливает состояние из списка, созданного to_list().
+
+        Args:
+            data (list): Сериализованное состояние
+
+        Returns:
+            LatencyStats: Восстановленная статистика
+        """
+
+        stats = cls()
+        (stats.count, stats.total, stats.compensation,
+         stats.mean, stats.m2, stats.min, stats.max) = data
+        return stats